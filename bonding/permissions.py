@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from meeting.models import MeetingMembership
+
 
 class UpdateOwnerOrAdmin(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
@@ -59,7 +61,9 @@ class IsAuthorOrAdmin(permissions.IsAuthenticated):
 
 class IsParticipant(permissions.IsAuthenticated):
     def has_object_permission(self, request, view, obj):
-        return obj.participants.filter(user=request.user.profile).exists()
+        return obj.memberships.filter(
+            profile=request.user.profile, role=MeetingMembership.PARTICIPANT
+        ).exists()
 
 
 class IsAuthorOrReadOnly(permissions.IsAuthenticated):
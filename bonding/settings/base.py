@@ -150,3 +150,40 @@ SIMPLE_JWT = {
 APPEND_SLASH = False
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# 선택 가능한 일정 집계 방식
+# "python"(비트마스크), "sql"(DB GROUP BY), "table"(MeetingSlotCount)
+CHOOSABLE_TIMES_BACKEND = secrets.get("CHOOSABLE_TIMES_BACKEND", "python")
+
+# 선택 가능한 일정을 백그라운드 워커(precompute_choosable_times)가 미리 계산할 일정 규모
+# 참여자 수 또는 가능 인원이 있는 슬롯 수가 기준 이상인 일정
+CHOOSABLE_TIMES_PRECOMPUTE_PARTICIPANTS = secrets.get(
+    "CHOOSABLE_TIMES_PRECOMPUTE_PARTICIPANTS", 100
+)
+CHOOSABLE_TIMES_PRECOMPUTE_SLOTS = secrets.get("CHOOSABLE_TIMES_PRECOMPUTE_SLOTS", 5000)
+
+# 미리 계산된 결과가 일정 변경 이후에도 반환될 수 있는 최대 시간(초)
+# 지나면 워커가 다시 계산할 때까지 요청 시 바로 계산
+CHOOSABLE_TIMES_SNAPSHOT_MAX_AGE = secrets.get("CHOOSABLE_TIMES_SNAPSHOT_MAX_AGE", 300)
+
+# 선택 가능한 일정 캐시를 모든 웹/워커 프로세스가 공유하도록
+# 프로세스 밖의 캐시 사용 (기본값은 DB 캐시 테이블, createcachetable로 생성)
+CACHES = secrets.get(
+    "CACHES",
+    {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+            "TIMEOUT": None,
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    },
+)
+
+# 선택 가능한 일정 캐시 적중/미적중 횟수를 프로세스마다 몇 번 모아 DB(CacheCounter)에 반영할지
+CHOOSABLE_TIMES_CACHE_STATS_FLUSH = secrets.get(
+    "CHOOSABLE_TIMES_CACHE_STATS_FLUSH", 100
+)
+
+# 프로세스마다 보관할 일정 시간 범위별 슬롯 격자 수 (meeting.cache.slot_grids)
+SLOT_GRID_CACHE_SIZE = secrets.get("SLOT_GRID_CACHE_SIZE", 128)
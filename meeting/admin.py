@@ -1,4 +1,31 @@
 from django.contrib import admin
-from .models import Meeting
+from .models import Meeting, AvailableTime
+
+
+class AvailableTimeAdmin(admin.ModelAdmin):
+    list_display = (
+        "participant",
+        "date",
+        "start_time",
+        "end_time",
+        "start_slot",
+        "end_slot",
+    )
+    list_select_related = ("participant",)
+    # 슬롯 순번으로 참여자별 시간순 정렬
+    ordering = ("participant", "start_slot")
+
+    # 슬롯 순번, 슬롯별 인원 수(MeetingSlotCount), 일정 version은 참여/수정 API에서만
+    # 함께 갱신되므로 관리자 화면에서는 조회만 허용
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 
 admin.site.register(Meeting)
+admin.site.register(AvailableTime, AvailableTimeAdmin)
@@ -0,0 +1,37 @@
+from django.db.models import Aggregate, CharField
+
+# MySQL GROUP_CONCAT 결과 최대 길이(byte), 기본값 1024는 참여자 id 100개 정도에서 잘림
+GROUP_CONCAT_MAX_LEN = 1024 * 1024
+
+
+def set_group_concat_max_len(sender, connection, **kwargs):
+    # connection_created 시그널 수신: MySQL 세션의 GROUP_CONCAT 길이 제한을 늘림
+    if connection.vendor != "mysql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SET SESSION group_concat_max_len = %s", [GROUP_CONCAT_MAX_LEN])
+
+
+class GroupConcat(Aggregate):
+    """
+    그룹별 값을 ","로 이어 붙인 문자열로 집계
+    (MySQL, SQLite: GROUP_CONCAT / PostgreSQL: STRING_AGG)
+    """
+
+    function = "GROUP_CONCAT"
+    template = "%(function)s(%(distinct)s%(expressions)s)"
+    allow_distinct = True
+
+    def __init__(self, expression, distinct=False, **extra):
+        super().__init__(
+            expression, distinct=distinct, output_field=CharField(), **extra
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            function="STRING_AGG",
+            template="%(function)s(%(distinct)s%(expressions)s::text, ',')",
+            **extra_context
+        )
@@ -1,5 +1,26 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
 
 
 class MeetingConfig(AppConfig):
     name = "meeting"
+
+    def ready(self):
+        from .aggregates import set_group_concat_max_len
+        from .availability import CHOOSABLE_TIMES_BACKENDS
+
+        # 잘못된 집계 방식은 요청 시 KeyError 대신 시작할 때 알림
+        if settings.CHOOSABLE_TIMES_BACKEND not in CHOOSABLE_TIMES_BACKENDS:
+            raise ImproperlyConfigured(
+                "CHOOSABLE_TIMES_BACKEND must be one of %s, got %r."
+                % (
+                    ", ".join(sorted(CHOOSABLE_TIMES_BACKENDS)),
+                    settings.CHOOSABLE_TIMES_BACKEND,
+                )
+            )
+
+        connection_created.connect(
+            set_group_concat_max_len, dispatch_uid="meeting.group_concat_max_len"
+        )
@@ -0,0 +1,644 @@
+import heapq
+from datetime import datetime, time as datetime_time, timedelta
+from django.conf import settings
+from django.db.models import Count, OuterRef, Subquery
+
+from .aggregates import GroupConcat
+from .cache import slot_grids
+from .models import AvailableTime
+from .slots import (
+    SLOT_MINUTES,
+    WEIGHT_IF_NEEDED,
+    expand_range,
+    slot_index,
+    slot_label,
+    to_minutes,
+)
+
+
+def iter_bits(mask):
+    # 켜진 비트 위치를 낮은 순서부터 반환
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def bit_counts(masks):
+    """
+    비트마스크 목록을 위치별로 더한 자리별 카운터
+    counts[i]의 p번째 비트는 위치 p에서 켜진 마스크 수의 i번째 자리
+    """
+    counts = []
+    for mask in masks:
+        carry = mask
+        for i, plane in enumerate(counts):
+            counts[i], carry = plane ^ carry, plane & carry
+            if not carry:
+                break
+        if carry:
+            counts.append(carry)
+    return counts
+
+
+def count_at(counts, position):
+    return sum((plane >> position & 1) << i for i, plane in enumerate(counts))
+
+
+def count_at_least(counts, threshold, universe):
+    # universe 중 카운터 값이 threshold 이상인 위치의 비트마스크 (상위 자리부터 비교)
+    if threshold <= 0:
+        return universe
+
+    greater, equal = 0, universe
+    for i in reversed(range(max(len(counts), threshold.bit_length()))):
+        plane = counts[i] if i < len(counts) else 0
+        if threshold >> i & 1:
+            equal &= plane
+        else:
+            greater |= equal & plane
+            equal &= ~plane
+    return greater | equal
+
+
+def slot_range(start_date, from_date=None, to_date=None, slot_minutes=SLOT_MINUTES):
+    # from_date 0시 ~ to_date 다음날 0시 전의 슬롯 위치 범위 (끝은 포함하지 않으며 없으면 None)
+    start = 0
+    if from_date:
+        start = max(
+            0, slot_index(start_date, from_date, datetime_time(0), slot_minutes)
+        )
+    end = None
+    if to_date:
+        end = slot_index(
+            start_date, to_date + timedelta(days=1), datetime_time(0), slot_minutes
+        )
+    return start, end
+
+
+class AvailabilityBitset:
+    """
+    참여 가능 시간 집계 엔진
+
+    일정 범위의 슬롯(slot_minutes 단위)마다 비트 위치를 부여하고 참여자별로 정수 비트마스크를
+    하나씩 유지한다. 슬롯별 가능 인원 수는 참여자 비트마스크를 자리별 카운터로 더해
+    모든 슬롯을 함께 비교하고, 불참자는 결과 슬롯에서만 참여자 비트마스크로 확인한다.
+    """
+
+    def __init__(self, start_date, slot_minutes=SLOT_MINUTES):
+        self.start_date = start_date
+        self.slot_minutes = slot_minutes
+        self.members = []  # 비트 위치 -> 참여자 이름
+        self.member_bits = {}  # 참여자 이름 -> 비트 위치
+        self.masks = []  # 참여자별 슬롯 비트마스크
+
+    @classmethod
+    def from_slots(cls, start_date, rows, slot_minutes=SLOT_MINUTES):
+        # rows: (참여자 이름, start_slot, end_slot) 구간 목록 (start_date 0시부터 센 순번)
+        bitset = cls(start_date, slot_minutes)
+        for name, start, end in rows:
+            bitset.add_slots(name, start, end)
+        return bitset
+
+    def member_bit(self, name):
+        bit = self.member_bits.get(name)
+        if bit is None:
+            bit = len(self.members)
+            self.member_bits[name] = bit
+            self.members.append(name)
+            self.masks.append(0)
+        return bit
+
+    def add_slots(self, name, start, end):
+        bit = self.member_bit(name)
+
+        # 구간 전체를 한 번의 비트 연산으로 표시 (start_date 이전 슬롯은 제외)
+        start = max(start, 0)
+        if end >= start:
+            self.masks[bit] |= ((1 << (end - start + 1)) - 1) << start
+
+    def slot_label(self, position):
+        return slot_label(self.start_date, position, self.slot_minutes)
+
+    def missing_mask(self, position, masks=None):
+        # position 슬롯에 불참하는 참여자의 비트마스크
+        missing_mask = 0
+        for bit, mask in enumerate(self.masks if masks is None else masks):
+            if not mask >> position & 1:
+                missing_mask |= 1 << bit
+        return missing_mask
+
+    def missing_members(self, missing_mask):
+        return [self.members[bit] for bit in iter_bits(missing_mask)]
+
+    def date_mask(self, from_date=None, to_date=None):
+        # from_date ~ to_date 날짜에 속한 슬롯 위치의 비트마스크
+        start, end = slot_range(self.start_date, from_date, to_date, self.slot_minutes)
+        mask = -1 << start
+        if end is not None:
+            mask &= (1 << max(end, 0)) - 1
+        return mask
+
+    def choosable_mask(self, max_missing=1, masks=None, within=-1):
+        # (자리별 카운터, within 중 불참자가 max_missing명 이하인 슬롯 위치의 비트마스크)
+        masks = self.masks if masks is None else masks
+        union = 0
+        for mask in masks:
+            union |= mask
+        union &= within
+        counts = bit_counts(masks)
+        threshold = len(self.members) - max_missing
+        return counts, count_at_least(counts, threshold, union)
+
+    def choosable_slots(self, max_missing=1, limit=None, within=-1):
+        # 불참자가 max_missing명 이하인 슬롯 위치 (날짜, 시간 순)
+        counts, candidates = self.choosable_mask(max_missing, within=within)
+        positions = iter_bits(candidates)
+        if limit is None:
+            return positions
+
+        # 가능 인원이 많은 순(같으면 이른 시간 순)으로 상위 limit개만 선택
+        best = heapq.nsmallest(
+            limit,
+            positions,
+            key=lambda position: (-count_at(counts, position), position),
+        )
+        return sorted(best)
+
+    def choosable_times(
+        self,
+        max_missing=1,
+        limit=None,
+        full_missing=False,
+        from_date=None,
+        to_date=None,
+    ):
+        # 날짜별로 묶어 기존 choosable-times 응답 형식으로 변환 (날짜, 시간 순)
+        # limit은 from_date ~ to_date 범위의 슬롯 중에서 고름
+        choosable_times = {}
+        within = self.date_mask(from_date, to_date)
+        for position in self.choosable_slots(max_missing, limit, within):
+            date, time = self.slot_label(position)
+            missing = self.missing_members(self.missing_mask(position))
+            detail = {
+                "time": time.isoformat(),
+                "unavailable_member": missing[0] if missing else None,
+            }
+            if full_missing:
+                detail["unavailable_members"] = missing
+            choosable_times.setdefault(date, []).append(detail)
+
+        return [
+            {"date": date.isoformat(), "detail": detail}
+            for date, detail in choosable_times.items()
+        ]
+
+    def window_masks(self, length):
+        """
+        참여자별로 시작 위치부터 length개 슬롯이 모두 가능한 시작 위치의 비트마스크
+
+        길이를 두 배씩 늘리며 마스크를 밀어 AND 하므로 log(length)번의 비트 연산으로
+        구한다. 슬롯 위치는 날짜를 이어 붙인 절대 위치라 자정을 넘는 구간도 연속으로 처리된다.
+        """
+        covers = []
+        for mask in self.masks:
+            span = 1
+            while span * 2 <= length:
+                mask &= mask >> span
+                span *= 2
+            if span < length:
+                mask &= mask >> (length - span)
+            covers.append(mask)
+        return covers
+
+    def choosable_windows(
+        self, duration, max_missing=1, limit=None, from_date=None, to_date=None
+    ):
+        # duration(분) 길이의 구간 전체가 가능한 참여자 기준으로 불참 인원이 적은 순으로 정렬
+        # (from_date ~ to_date에 시작하는 구간만)
+        length = duration // self.slot_minutes
+        covers = self.window_masks(length)
+        counts, candidates = self.choosable_mask(
+            max_missing, covers, self.date_mask(from_date, to_date)
+        )
+
+        total = len(self.members)
+        windows = (
+            (total - count_at(counts, start), start) for start in iter_bits(candidates)
+        )
+        if limit is None:
+            windows = sorted(windows)
+        else:
+            windows = heapq.nsmallest(limit, windows)
+
+        choosable_windows = []
+        for _, start in windows:
+            start_datetime = datetime.combine(*self.slot_label(start))
+            end_datetime = datetime.combine(
+                *self.slot_label(start + length - 1)
+            ) + timedelta(minutes=self.slot_minutes)
+            choosable_windows.append(
+                {
+                    "start_datetime": start_datetime.strftime("%Y-%m-%d %H:%M:%S"),
+                    "end_datetime": end_datetime.strftime("%Y-%m-%d %H:%M:%S"),
+                    "unavailable_members": self.missing_members(
+                        self.missing_mask(start, covers)
+                    ),
+                }
+            )
+        return choosable_windows
+
+
+def date_window(meeting, from_date=None, to_date=None):
+    # 일정 기간 중 from_date ~ to_date와 겹치는 (시작일, 종료일)
+    start_date = max(meeting.start_date, from_date or meeting.start_date)
+    end_date = min(meeting.end_date, to_date or meeting.end_date)
+    return start_date, end_date
+
+
+def full_range_times(meeting, from_date=None, to_date=None, full_missing=False):
+    """
+    참여자 없이 팀장이 일정 확정하는 경우 일정 전체 범위를 날짜별로 생성
+
+    하루치 슬롯 목록은 한 번만 만들어 모든 날짜가 공유하고, 날짜는 일정 기간 중
+    from_date ~ to_date 범위만 필요할 때 하나씩 만든다.
+    """
+    detail = []
+    grid = slot_grids.get(meeting.start_time, meeting.end_time, meeting.granularity)
+    for label in grid.labels:
+        slot = {"time": label, "unavailable_member": None}
+        if full_missing:
+            slot["unavailable_members"] = []
+        detail.append(slot)
+
+    start_date, end_date = date_window(meeting, from_date, to_date)
+    for days in range((end_date - start_date).days + 1):
+        yield {
+            "date": (start_date + timedelta(days=days)).isoformat(),
+            "detail": detail,
+        }
+
+
+def meeting_heatmap(meeting, from_date=None, to_date=None):
+    """
+    일정 슬롯 격자의 모든 슬롯별 가능 인원 수
+
+    미리 집계된 MeetingSlotCount를 한 번 조회해 날짜별 인원 수 배열을 채운다.
+    counts[i]는 times[i] 슬롯의 인원 수이며 아무도 가능하지 않은 슬롯은 0이다.
+    """
+    grid = slot_grids.get(meeting.start_time, meeting.end_time, meeting.granularity)
+    start_date, end_date = date_window(meeting, from_date, to_date)
+
+    counts = [[0] * len(grid.times) for _ in range((end_date - start_date).days + 1)]
+    rows = meeting.slot_counts.filter(date__range=(start_date, end_date)).values_list(
+        "date", "time", "count"
+    )
+    for date, time, count in rows:
+        index = grid.indexes.get(to_minutes(time))
+        if index is not None:
+            counts[(date - start_date).days][index] = count
+
+    return {
+        "slot_minutes": meeting.granularity,
+        "members": meeting.participants.filter(available_times__isnull=False)
+        .distinct()
+        .count(),
+        "times": list(grid.labels),
+        "dates": [
+            {
+                "date": (start_date + timedelta(days=days)).isoformat(),
+                "counts": date_counts,
+            }
+            for days, date_counts in enumerate(counts)
+        ],
+    }
+
+
+def meeting_bitset(meeting):
+    # 참여자별 available_times를 비트마스크로 수합
+    rows = (
+        AvailableTime.objects.filter(participant__meeting=meeting)
+        .order_by("participant_id", "start_slot")
+        .values_list("participant__name", "start_slot", "end_slot")
+    )
+    return AvailabilityBitset.from_slots(meeting.start_date, rows, meeting.granularity)
+
+
+def bitset_choosable_times(
+    meeting,
+    max_missing=1,
+    limit=None,
+    full_missing=False,
+    from_date=None,
+    to_date=None,
+):
+    bitset = meeting_bitset(meeting)
+    if not bitset.members:
+        return None
+
+    return bitset.choosable_times(max_missing, limit, full_missing, from_date, to_date)
+
+
+def gather_choosable_windows(
+    meeting, duration, max_missing=1, limit=None, from_date=None, to_date=None
+):
+    # 연속 구간 탐색은 참여자별 비트마스크로 계산
+    bitset = meeting_bitset(meeting)
+    if not bitset.members:
+        return None
+
+    return bitset.choosable_windows(duration, max_missing, limit, from_date, to_date)
+
+
+def weighted_choosable_times(
+    meeting, max_missing=1, limit=None, from_date=None, to_date=None
+):
+    """
+    선호도 가중치 합(점수)이 높은 순으로 슬롯 정렬 (같으면 이른 시간 순)
+
+    참여자 x 슬롯 가중치 행렬을 NumPy로 만들어 구간마다 slice 대입으로 채우고,
+    슬롯별 점수와 가능 인원을 열 단위로 한 번에 계산한다.
+    """
+    import numpy as np
+
+    rows = list(
+        AvailableTime.objects.filter(participant__meeting=meeting)
+        .order_by("participant_id", "start_slot")
+        .values_list(
+            "participant_id", "participant__name", "start_slot", "end_slot", "weight"
+        )
+    )
+    if not rows:
+        return None
+
+    members = dict(row[:2] for row in rows)  # 참여자 id -> 이름 (행 순서)
+    member_rows = {id: index for index, id in enumerate(members)}
+    names = list(members.values())
+    base = min(row[2] for row in rows)
+    matrix = np.zeros(
+        (len(members), max(row[3] for row in rows) - base + 1), dtype=np.int8
+    )
+    for participant_id, _, start, end, weight in rows:
+        matrix[member_rows[participant_id], start - base : end - base + 1] = weight
+
+    scores = matrix.sum(axis=0, dtype=np.int32)
+    available = np.count_nonzero(matrix, axis=0)
+    # from_date ~ to_date 범위의 슬롯 중에서 순위를 매김
+    positions = base + np.arange(matrix.shape[1])
+    start, end = slot_range(meeting.start_date, from_date, to_date, meeting.granularity)
+    in_window = positions >= start
+    if end is not None:
+        in_window &= positions < end
+    candidates = np.flatnonzero(
+        in_window & (available > 0) & (available >= len(members) - max_missing)
+    )
+    ranked = candidates[np.lexsort((candidates, -scores[candidates]))]
+    if limit is not None:
+        ranked = ranked[:limit]
+
+    choosable_times = []
+    for column in ranked:
+        date, time = slot_label(
+            meeting.start_date, base + int(column), meeting.granularity
+        )
+        weights = matrix[:, column]
+        choosable_times.append(
+            {
+                "date": date.isoformat(),
+                "time": time.isoformat(),
+                "score": int(scores[column]),
+                "unavailable_members": [
+                    names[index] for index in np.flatnonzero(weights == 0)
+                ],
+                "if_needed_members": [
+                    names[index]
+                    for index in np.flatnonzero(weights == WEIGHT_IF_NEEDED)
+                ],
+            }
+        )
+    return choosable_times
+
+
+def available_members(meeting):
+    # 참여 가능 시간이 있는 참여자 {id: 이름}
+    return dict(
+        meeting.participants.filter(available_times__isnull=False)
+        .distinct()
+        .order_by("id")
+        .values_list("id", "name")
+    )
+
+
+def candidate_slots(
+    slots, threshold, limit=None, count="count", from_date=None, to_date=None
+):
+    # slots: date, time, 인원 수(count) 값을 가진 queryset
+    # limit은 from_date ~ to_date 범위의 슬롯 중에서 고름
+    slots = slots.filter(**{f"{count}__gte": threshold})
+    if from_date:
+        slots = slots.filter(date__gte=from_date)
+    if to_date:
+        slots = slots.filter(date__lte=to_date)
+    if limit is None:
+        return slots.order_by("date", "time")
+
+    return sorted(
+        slots.order_by(f"-{count}", "date", "time")[:limit],
+        key=lambda slot: (slot["date"], slot["time"]),
+    )
+
+
+def format_choosable_times(slots, members, full_missing=False):
+    # slots: (date, time, 가능한 참여자 id 집합) 목록
+    choosable_times = {}
+    for date, time, available in slots:
+        missing = [name for id, name in members.items() if id not in available]
+        detail = {
+            "time": time.isoformat(),
+            "unavailable_member": missing[0] if missing else None,
+        }
+        if full_missing:
+            detail["unavailable_members"] = missing
+        choosable_times.setdefault(date, []).append(detail)
+
+    return [
+        {"date": date.isoformat(), "detail": detail}
+        for date, detail in choosable_times.items()
+    ]
+
+
+def compact_choosable_times(choosable_times, slot_minutes=SLOT_MINUTES):
+    """
+    choosable-times 응답을 열 단위로 압축
+
+    슬롯마다 반복되는 키 대신 날짜별로 슬롯 인덱스(하루 중 몇 번째 슬롯인지)
+    배열과 불참자 배열을 두고, 불참자는 members 테이블의 인덱스로 표시한다.
+    """
+    members = {}
+
+    def member_index(name):
+        return members.setdefault(name, len(members))
+
+    dates = []
+    for date in choosable_times:
+        detail = date["detail"]
+        column = {
+            "date": str(date["date"]),
+            "slots": [
+                to_minutes(datetime_time.fromisoformat(slot["time"])) // slot_minutes
+                for slot in detail
+            ],
+            "unavailable_member": [
+                None
+                if slot["unavailable_member"] is None
+                else member_index(slot["unavailable_member"])
+                for slot in detail
+            ],
+        }
+        if detail and "unavailable_members" in detail[0]:
+            column["unavailable_members"] = [
+                [member_index(name) for name in slot["unavailable_members"]]
+                for slot in detail
+            ]
+        dates.append(column)
+
+    return {"slot_minutes": slot_minutes, "members": list(members), "dates": dates}
+
+
+def compact_choosable_windows(choosable_windows):
+    # 연속 구간 응답의 불참자를 members 테이블의 인덱스로 압축
+    members = {}
+    windows = [
+        {
+            "start_datetime": window["start_datetime"],
+            "end_datetime": window["end_datetime"],
+            "unavailable_members": [
+                members.setdefault(name, len(members))
+                for name in window["unavailable_members"]
+            ],
+        }
+        for window in choosable_windows
+    ]
+    return {"members": list(members), "windows": windows}
+
+
+def sql_choosable_times(
+    meeting,
+    max_missing=1,
+    limit=None,
+    full_missing=False,
+    from_date=None,
+    to_date=None,
+):
+    members = available_members(meeting)
+    if not members:
+        return None
+
+    # 슬롯 격자(MeetingSlotCount)의 각 슬롯을 포함하는 구간을 DB에서 집계해
+    # 인원 수와 참여자 id를 구하고 후보 슬롯만 가져오기
+    covering = (
+        AvailableTime.objects.filter(
+            participant__meeting=OuterRef("meeting"),
+            date=OuterRef("date"),
+            start_time__lte=OuterRef("time"),
+            end_time__gte=OuterRef("time"),
+        )
+        .order_by()
+        .values("date")
+    )
+    slots = candidate_slots(
+        meeting.slot_counts.annotate(
+            available_count=Subquery(
+                covering.annotate(count=Count("participant", distinct=True)).values(
+                    "count"
+                )
+            ),
+            participant_ids=Subquery(
+                covering.annotate(ids=GroupConcat("participant", distinct=True)).values(
+                    "ids"
+                )
+            ),
+        ).values("date", "time", "available_count", "participant_ids"),
+        len(members) - max_missing,
+        limit,
+        count="available_count",
+        from_date=from_date,
+        to_date=to_date,
+    )
+
+    available = []
+    for slot in slots:
+        ids = {int(id) for id in slot["participant_ids"].split(",") if id}
+        # GROUP_CONCAT 결과가 DB 길이 제한으로 잘리면 참여자 id 수가 인원 수와 달라짐
+        # (잘린 id로 불참자를 잘못 표시하지 않도록 비트마스크 방식으로 계산)
+        if len(ids) != slot["available_count"]:
+            return bitset_choosable_times(
+                meeting, max_missing, limit, full_missing, from_date, to_date
+            )
+        available.append((slot["date"], slot["time"], ids))
+
+    return format_choosable_times(available, members, full_missing)
+
+
+def table_choosable_times(
+    meeting,
+    max_missing=1,
+    limit=None,
+    full_missing=False,
+    from_date=None,
+    to_date=None,
+):
+    members = available_members(meeting)
+    if not members:
+        return None
+
+    # 미리 집계된 MeetingSlotCount에서 후보 슬롯 조회
+    slots = list(
+        candidate_slots(
+            meeting.slot_counts.values("date", "time", "count"),
+            len(members) - max_missing,
+            limit,
+            from_date=from_date,
+            to_date=to_date,
+        )
+    )
+
+    # 불참자가 있는 슬롯만 참여자 조회
+    partial = {
+        (slot["date"], slot["time"]) for slot in slots if slot["count"] < len(members)
+    }
+    available = {key: set() for key in partial}
+    if partial:
+        rows = AvailableTime.objects.filter(
+            participant__meeting=meeting, date__in={date for date, _ in partial}
+        ).values_list("date", "start_time", "end_time", "participant_id")
+        for date, start_time, end_time, participant_id in rows:
+            for time in expand_range(start_time, end_time, meeting.granularity):
+                if (date, time) in available:
+                    available[(date, time)].add(participant_id)
+
+    return format_choosable_times(
+        (
+            (
+                slot["date"],
+                slot["time"],
+                available.get((slot["date"], slot["time"]), members),
+            )
+            for slot in slots
+        ),
+        members,
+        full_missing,
+    )
+
+
+# settings.CHOOSABLE_TIMES_BACKEND로 배포 환경별 집계 방식 선택
+CHOOSABLE_TIMES_BACKENDS = {
+    "python": bitset_choosable_times,
+    "sql": sql_choosable_times,
+    "table": table_choosable_times,
+}
+
+
+def gather_choosable_times(meeting, **options):
+    backend = CHOOSABLE_TIMES_BACKENDS[settings.CHOOSABLE_TIMES_BACKEND]
+    return backend(meeting, **options)
@@ -0,0 +1,122 @@
+import threading
+from collections import Counter
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import CacheCounter, Meeting
+from .slots import SlotGridCache
+
+CHOOSABLE_TIMES_PREFIX = "choosable-times"
+CHOOSABLE_TIMES_HITS = f"{CHOOSABLE_TIMES_PREFIX}:hits"
+CHOOSABLE_TIMES_MISSES = f"{CHOOSABLE_TIMES_PREFIX}:misses"
+SLOT_GRID_HITS = "slot-grid:hits"
+SLOT_GRID_MISSES = "slot-grid:misses"
+
+
+def bump_version(meeting_id):
+    """
+    참여자 가입/탈퇴, available_times 변경, 일정 수정 시 호출
+    버전이 바뀌면 이전 캐시 키는 다시 조회되지 않으므로 TTL 없이 만료된다.
+    """
+    Meeting.objects.filter(id=meeting_id).update(version=F("version") + 1)
+
+
+def choosable_times_key(meeting, **options):
+    params = ":".join(f"{key}={options[key]}" for key in sorted(options))
+    return f"{CHOOSABLE_TIMES_PREFIX}:{meeting.id}:v{meeting.version}:{params}"
+
+
+# 프로세스 안에서 모아 둔 적중/미적중 횟수 (CHOOSABLE_TIMES_CACHE_STATS_FLUSH번마다 DB에 반영)
+pending_counts = Counter()
+pending_lock = threading.Lock()
+
+
+def count(name):
+    # 조회 경로에서는 DB에 쓰지 않고 모아 두었다가 한 번에 반영
+    with pending_lock:
+        pending_counts[name] += 1
+        if sum(pending_counts.values()) < settings.CHOOSABLE_TIMES_CACHE_STATS_FLUSH:
+            return
+    flush_cache_stats()
+
+
+def flush_cache_stats():
+    # 모아 둔 횟수를 카운터 row에 원자적으로(F() UPDATE) 더함
+    with pending_lock:
+        counts = dict(pending_counts)
+        pending_counts.clear()
+    if not counts:
+        return
+
+    CacheCounter.objects.bulk_create(
+        [CacheCounter(name=name) for name in counts], ignore_conflicts=True
+    )
+    for name, value in counts.items():
+        CacheCounter.objects.filter(name=name).update(value=F("value") + value)
+
+
+# 프로세스 안에서 공유하는 슬롯 격자 캐시 (적중/미적중 횟수는 CacheCounter에 함께 집계)
+slot_grids = SlotGridCache(
+    maxsize=settings.SLOT_GRID_CACHE_SIZE,
+    on_hit=partial(count, SLOT_GRID_HITS),
+    on_miss=partial(count, SLOT_GRID_MISSES),
+)
+
+
+def get_choosable_times(meeting, compute, **options):
+    key = choosable_times_key(meeting, **options)
+    choosable_times = cache.get(key)
+    if choosable_times is not None:
+        count(CHOOSABLE_TIMES_HITS)
+        return choosable_times
+
+    count(CHOOSABLE_TIMES_MISSES)
+    choosable_times = compute()
+    cache.set(key, choosable_times, timeout=None)
+    return choosable_times
+
+
+def counter_stats(hits_name, misses_name):
+    counters = dict(
+        CacheCounter.objects.filter(name__in=[hits_name, misses_name]).values_list(
+            "name", "value"
+        )
+    )
+    hits = counters.get(hits_name, 0)
+    misses = counters.get(misses_name, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
+
+
+def cache_stats():
+    flush_cache_stats()
+    return counter_stats(CHOOSABLE_TIMES_HITS, CHOOSABLE_TIMES_MISSES)
+
+
+def slot_grid_stats():
+    # 모든 프로세스의 적중/미적중 횟수, 격자 수와 메모리는 현재 프로세스 기준
+    flush_cache_stats()
+    return {
+        **slot_grids.stats(),
+        **counter_stats(SLOT_GRID_HITS, SLOT_GRID_MISSES),
+    }
+
+
+def reset_cache_stats():
+    with pending_lock:
+        pending_counts.clear()
+    CacheCounter.objects.filter(
+        name__in=[
+            CHOOSABLE_TIMES_HITS,
+            CHOOSABLE_TIMES_MISSES,
+            SLOT_GRID_HITS,
+            SLOT_GRID_MISSES,
+        ]
+    ).delete()
@@ -20,6 +20,16 @@ class InvalidAvailableTimeException(APIException):
     status_code = 400
     default_detail = "가능한 시간 리스트가 일정의 조건에 맞지 않습니다."
 
+    def __init__(self, slots=None, detail=None, code=None):
+        # 조건에 맞지 않는 (date, time) 슬롯을 모두 메시지에 표시
+        self.slots = slots or []
+        if slots and detail is None:
+            detail = "%s (%s)" % (
+                self.default_detail,
+                ", ".join(f"{date} {time:%H:%M}" for date, time in slots),
+            )
+        super().__init__(detail, code)
+
 
 class NotParticipantException(APIException):
     status_code = 403
@@ -39,3 +49,13 @@ class ParticipantNotFoundException(APIException):
 class ParticipantNameExistException(APIException):
     status_code = 409
     default_detail = "닉네임 중복"
+
+
+class GranularityChangeException(APIException):
+    status_code = 409
+    default_detail = "가능한 시간이 제출된 일정은 시간 단위를 변경할 수 없습니다."
+
+
+class MeetingAlreadyConfirmedException(APIException):
+    status_code = 409
+    default_detail = "이미 확정된 일정은 가능한 시간을 수정할 수 없습니다."
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from meeting.cache import cache_stats, reset_cache_stats, slot_grid_stats
+
+
+class Command(BaseCommand):
+    help = "선택 가능한 일정(choosable-times)과 슬롯 격자 캐시 적중/미적중 횟수를 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="출력 후 카운터 초기화")
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+        self.stdout.write(
+            "hits: {hits}, misses: {misses}, hit rate: {hit_rate:.1%}".format(**stats)
+        )
+        stats = slot_grid_stats()
+        self.stdout.write(
+            "slot grid hits: {hits}, misses: {misses}, hit rate: {hit_rate:.1%}, "
+            "maxsize: {maxsize}".format(**stats)
+        )
+
+        if options["reset"]:
+            reset_cache_stats()
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from meeting.precompute import precompute
+
+
+class Command(BaseCommand):
+    help = "규모가 큰 일정의 선택 가능한 일정을 미리 계산해 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=None, help="계산 프로세스 수 (기본: CPU 수)"
+        )
+        parser.add_argument("--batch", type=int, default=100, help="한 번에 계산할 최대 일정 수")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="지정 시 초 단위 간격으로 계속 실행 (생략 시 한 번만 실행)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            computed = precompute(limit=options["batch"], workers=options["workers"])
+            self.stdout.write(f"{computed}개 일정의 선택 가능한 일정 계산 완료")
+
+            if not options["interval"]:
+                break
+            # 밀린 일정이 남아 있으면 바로 이어서 계산
+            if computed < options["batch"]:
+                time.sleep(options["interval"])
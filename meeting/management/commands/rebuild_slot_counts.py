@@ -0,0 +1,54 @@
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from meeting.models import Meeting, AvailableTime, MeetingSlotCount
+from meeting.slots import expand_ranges
+
+
+class Command(BaseCommand):
+    help = "available_times로부터 일정별 슬롯 인원 수(MeetingSlotCount)를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "meeting_ids", nargs="*", type=int, help="대상 일정 id (생략 시 전체)"
+        )
+
+    def handle(self, *args, **options):
+        meetings = Meeting.objects.order_by("id")
+        if options["meeting_ids"]:
+            meetings = meetings.filter(id__in=options["meeting_ids"])
+
+        rebuilt = 0
+        for meeting in meetings.iterator():
+            self.rebuild(meeting)
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{rebuilt}개 일정의 슬롯 인원 수 재계산 완료"))
+
+    def rebuild(self, meeting):
+        with transaction.atomic():
+            # 가입/탈퇴와 동시에 실행되지 않도록 일정 잠금
+            Meeting.objects.select_for_update().get(id=meeting.id)
+
+            # 참여자별 구간을 슬롯으로 펼쳐 인원 수 집계
+            counts = Counter()
+            ranges = AvailableTime.objects.filter(participant__meeting=meeting)
+            for participant_id, slots in groupby(
+                ranges.order_by("participant_id").values_list(
+                    "participant_id", "date", "start_time", "end_time"
+                ),
+                key=itemgetter(0),
+            ):
+                counts.update(
+                    set(expand_ranges((row[1:] for row in slots), meeting.granularity))
+                )
+
+            meeting.slot_counts.all().delete()
+            MeetingSlotCount.objects.bulk_create(
+                MeetingSlotCount(meeting=meeting, date=date, time=time, count=count)
+                for (date, time), count in counts.items()
+            )
@@ -0,0 +1,250 @@
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.db import models
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from .slots import (
+    WEIGHT_PREFERRED,
+    compress_weighted_slots,
+    expand_range,
+    expand_ranges,
+    slot_index,
+    slots_per_day,
+)
+
+
+class MemberQuerySet(models.QuerySet):
+    """
+    팀장이거나 참여자인 일정(또는 그 일정에 속한 행) 조회
+    참여자 JOIN + DISTINCT 대신 MeetingMembership 인덱스에서 일정 id만 조회
+    meeting_lookup: 일정까지의 경로 (일정 자신이면 빈 문자열)
+    """
+
+    meeting_lookup = ""
+
+    def for_member(self, profile, unexpired=False):
+        # unexpired: 만료되지 않은 일정만
+        memberships = apps.get_model("meeting", "MeetingMembership").objects.filter(
+            profile=profile
+        )
+        if unexpired:
+            memberships = memberships.filter(expired_at__gte=timezone.now())
+        return self.filter(
+            **{f"{self.meeting_lookup or 'pk'}__in": memberships.values("meeting")}
+        )
+
+
+class MeetingQuerySet(MemberQuerySet):
+    pass
+
+
+class ConfirmedTimeQuerySet(MemberQuerySet):
+    meeting_lookup = "meeting"
+
+
+class AvailableTimeManager(models.Manager):
+    def create_slots(self, participant, slots):
+        """
+        슬롯을 가중치가 같은 연속 구간으로 합쳐 한 번의 INSERT로 저장
+        slots: {(date, time): weight} 또는 (date, time) 목록 (모두 선호)
+        """
+        if not isinstance(slots, dict):
+            slots = dict.fromkeys(slots, WEIGHT_PREFERRED)
+
+        meeting = participant.meeting
+        return self.bulk_create(
+            (
+                self.model(
+                    participant=participant,
+                    date=date,
+                    start_time=start_time,
+                    end_time=end_time,
+                    weight=weight,
+                    start_slot=slot_index(
+                        meeting.start_date, date, start_time, meeting.granularity
+                    ),
+                    end_slot=slot_index(
+                        meeting.start_date, date, end_time, meeting.granularity
+                    ),
+                )
+                for date, start_time, end_time, weight in compress_weighted_slots(
+                    slots, meeting.granularity
+                )
+            )
+        )
+
+    def shift_slots(self, meeting, days):
+        # 일정 시작일이 days일 바뀌면 슬롯 순번을 한 번의 UPDATE로 이동
+        # 새 시작일보다 앞선 날짜의 가능 시간은 일정 범위를 벗어나 음수 순번이 되므로 삭제
+        self.filter(participant__meeting=meeting, date__lt=meeting.start_date).delete()
+        offset = days * slots_per_day(meeting.granularity)
+        return self.filter(participant__meeting=meeting).update(
+            start_slot=F("start_slot") - offset, end_slot=F("end_slot") - offset
+        )
+
+    def update_slots(self, participant, added=None, removed=()):
+        """
+        참여자의 가능 시간에 슬롯을 추가/삭제하고 바뀐 날짜의 구간만 다시 저장
+        (바뀐 날짜의 구간을 한 번에 DELETE 후 다시 합쳐 한 번에 INSERT)
+
+        added: {(date, time): weight} 또는 (date, time) 목록, 겹치는 슬롯은 새 가중치
+        removed: (date, time) 목록
+        실제로 새로 생긴 슬롯과 없어진 슬롯의 집합을 반환
+        """
+        added = added or {}
+        if not isinstance(added, dict):
+            added = dict.fromkeys(added, WEIGHT_PREFERRED)
+        removed = set(removed) - set(added)
+
+        existing = participant.available_times.filter(
+            date__in={date for date, _ in added} | {date for date, _ in removed}
+        )
+        slots = {}
+        for date, start_time, end_time, weight in existing.values_list(
+            "date", "start_time", "end_time", "weight"
+        ):
+            for time in expand_range(
+                start_time, end_time, participant.meeting.granularity
+            ):
+                slots[(date, time)] = weight
+        previous = set(slots)
+
+        for slot in removed:
+            slots.pop(slot, None)
+        slots.update(added)
+
+        existing.delete()
+        self.create_slots(participant, slots)
+        return set(slots) - previous, previous - set(slots)
+
+    def replace_slots(self, participant, slots):
+        # 참여자의 가능 시간 전체를 slots로 교체 (update_slots와 같은 값 반환)
+        current = expand_ranges(
+            participant.available_times.values_list("date", "start_time", "end_time"),
+            participant.meeting.granularity,
+        )
+        return self.update_slots(participant, slots, removed=current)
+
+
+class MeetingSlotCountManager(models.Manager):
+    """
+    참여자 가입/탈퇴 시 슬롯별 인원 수를 증감
+    (가입/탈퇴와 같은 트랜잭션 안에서 호출)
+    """
+
+    def participant_slots(self, participant):
+        # 참여자의 available_times 구간에 포함된 슬롯
+        available_times = participant.available_times.filter(
+            date=OuterRef("date"),
+            start_time__lte=OuterRef("time"),
+            end_time__gte=OuterRef("time"),
+        )
+        return self.filter(meeting_id=participant.meeting_id).filter(
+            Exists(available_times)
+        )
+
+    def add_participant(self, participant, slots=None):
+        # slots: 참여자의 (date, time) 슬롯 (이미 알고 있으면 다시 조회하지 않음)
+        if slots is None:
+            slots = expand_ranges(
+                participant.available_times.values_list(
+                    "date", "start_time", "end_time"
+                ),
+                participant.meeting.granularity,
+            )
+
+        counts = self.participant_slots(participant)
+        existing = set(counts.values_list("date", "time"))
+        counts.update(count=F("count") + 1)
+
+        # 처음 선택된 슬롯 생성
+        new_slots = set(slots)
+        self.bulk_create(
+            self.model(meeting_id=participant.meeting_id, date=date, time=time, count=1)
+            for date, time in new_slots - existing
+        )
+
+    def remove_participant(self, participant):
+        self.participant_slots(participant).filter(count__gt=0).update(
+            count=F("count") - 1
+        )
+        self.filter(meeting_id=participant.meeting_id, count=0).delete()
+
+    def slots_filter(self, slots):
+        # (date, time) 슬롯 목록을 날짜별 time__in 조건으로 묶음
+        times_by_date = {}
+        for date, time in slots:
+            times_by_date.setdefault(date, []).append(time)
+        return reduce(
+            or_,
+            (Q(date=date, time__in=times) for date, times in times_by_date.items()),
+            Q(),
+        )
+
+    def update_slots(self, meeting_id, added=(), removed=()):
+        # 가능 시간 수정으로 새로 생긴/없어진 슬롯의 인원 수만 증감
+        if removed:
+            counts = self.filter(self.slots_filter(removed), meeting_id=meeting_id)
+            counts.filter(count__gt=0).update(count=F("count") - 1)
+            counts.filter(count=0).delete()
+
+        if added:
+            counts = self.filter(self.slots_filter(added), meeting_id=meeting_id)
+            existing = set(counts.values_list("date", "time"))
+            counts.update(count=F("count") + 1)
+            self.bulk_create(
+                self.model(meeting_id=meeting_id, date=date, time=time, count=1)
+                for date, time in set(added) - existing
+            )
+
+
+class MeetingMembershipManager(models.Manager):
+    """
+    일정 생성/참여/나가기, 일정 확정 시 프로필별 일정 목록 갱신
+    (같은 트랜잭션 안에서 호출)
+    """
+
+    def add_author(self, meeting):
+        if meeting.author_id is None:
+            return
+        self.bulk_create(
+            [
+                self.model(
+                    profile_id=meeting.author_id,
+                    meeting=meeting,
+                    role=self.model.AUTHOR,
+                    expired_at=meeting.expired_at,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+    def sync_participant(self, meeting, profile_id):
+        # 프로필의 참여자가 남아 있으면 팀원으로 추가, 없으면 삭제
+        if profile_id is None:
+            return
+        participants = apps.get_model("meeting", "Participant").objects.filter(
+            meeting=meeting, user_id=profile_id
+        )
+        if participants.exists():
+            self.bulk_create(
+                [
+                    self.model(
+                        profile_id=profile_id,
+                        meeting=meeting,
+                        role=self.model.PARTICIPANT,
+                        expired_at=meeting.expired_at,
+                    )
+                ],
+                ignore_conflicts=True,
+            )
+        else:
+            self.filter(
+                meeting=meeting, profile_id=profile_id, role=self.model.PARTICIPANT
+            ).delete()
+
+    def sync_expired_at(self, meeting):
+        self.filter(meeting=meeting).update(expired_at=meeting.expired_at)
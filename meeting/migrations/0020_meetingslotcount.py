@@ -0,0 +1,59 @@
+# Generated by Django 3.1.3 on 2026-10-18 06:08
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def build_slot_counts(apps, schema_editor):
+    AvailableTime = apps.get_model("meeting", "AvailableTime")
+    MeetingSlotCount = apps.get_model("meeting", "MeetingSlotCount")
+
+    slots = (
+        AvailableTime.objects.values("participant__meeting", "date", "time")
+        .annotate(count=Count("participant", distinct=True))
+        .order_by()
+    )
+    MeetingSlotCount.objects.bulk_create(
+        (
+            MeetingSlotCount(
+                meeting_id=slot["participant__meeting"],
+                date=slot["date"],
+                time=slot["time"],
+                count=slot["count"],
+            )
+            for slot in slots.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0019_auto_20210413_1748"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MeetingSlotCount",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("date", models.DateField()),
+                ("time", models.TimeField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slot_counts",
+                        to="meeting.meeting",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("meeting", "date", "time")},
+            },
+        ),
+        migrations.RunPython(build_slot_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.3 on 2026-10-18 06:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0020_meetingslotcount"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meeting",
+            name="version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
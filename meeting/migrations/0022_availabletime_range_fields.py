@@ -0,0 +1,23 @@
+# Generated by Django 3.1.3 on 2026-10-18 06:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0021_meeting_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="availabletime",
+            name="start_time",
+            field=models.TimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name="availabletime",
+            name="end_time",
+            field=models.TimeField(null=True),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 3.1.3 on 2026-10-18 06:30
+
+from datetime import time as datetime_time
+
+from django.db import migrations, models
+
+SLOT_MINUTES = 10
+
+
+def to_minutes(time):
+    return time.hour * 60 + time.minute
+
+
+def from_minutes(minutes):
+    return datetime_time(minutes // 60, minutes % 60)
+
+
+def compact_available_times(apps, schema_editor):
+    """
+    참여자별 10분 슬롯 row를 연속 구간 row로 압축
+    구간마다 첫 row를 남겨 start_time/end_time을 채우고 나머지 row는 삭제
+    """
+    Participant = apps.get_model("meeting", "Participant")
+    AvailableTime = apps.get_model("meeting", "AvailableTime")
+
+    participant_ids = (
+        AvailableTime.objects.filter(start_time__isnull=True)
+        .values_list("participant_id", flat=True)
+        .distinct()
+    )
+    for participant in Participant.objects.filter(id__in=list(participant_ids)):
+        rows = AvailableTime.objects.filter(
+            participant=participant, start_time__isnull=True
+        ).order_by("date", "time", "id")
+
+        ranges = []  # [첫 row id, date, start_time, end_time]
+        redundant = []
+        for id, date, time in rows.values_list("id", "date", "time"):
+            time = datetime_time(time.hour, time.minute)
+            if ranges and ranges[-1][1] == date:
+                gap = to_minutes(time) - to_minutes(ranges[-1][3])
+                if gap <= SLOT_MINUTES:
+                    # 이어지는 슬롯이거나 중복 슬롯
+                    ranges[-1][3] = max(time, ranges[-1][3])
+                    redundant.append(id)
+                    continue
+            ranges.append([id, date, time, time])
+
+        for id, date, start_time, end_time in ranges:
+            AvailableTime.objects.filter(id=id).update(
+                start_time=start_time, end_time=end_time
+            )
+        AvailableTime.objects.filter(id__in=redundant).delete()
+
+
+def expand_available_times(apps, schema_editor):
+    """
+    compact_available_times의 역방향: 구간 row를 10분 슬롯 row로 되돌림
+    구간의 첫 row에 time=start_time을 채우고 나머지 슬롯은 새 row로 생성
+    """
+    AvailableTime = apps.get_model("meeting", "AvailableTime")
+
+    rows = AvailableTime.objects.filter(start_time__isnull=False).order_by("id")
+    slots = []
+    for id, participant_id, date, start_time, end_time in list(
+        rows.values_list("id", "participant_id", "date", "start_time", "end_time")
+    ):
+        AvailableTime.objects.filter(id=id).update(time=start_time)
+        for minutes in range(
+            to_minutes(start_time) + SLOT_MINUTES,
+            to_minutes(end_time) + 1,
+            SLOT_MINUTES,
+        ):
+            slots.append(
+                AvailableTime(
+                    participant_id=participant_id,
+                    date=date,
+                    time=from_minutes(minutes),
+                )
+            )
+    AvailableTime.objects.bulk_create(slots, batch_size=1000)
+    AvailableTime.objects.update(start_time=None, end_time=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0022_availabletime_range_fields"),
+    ]
+
+    operations = [
+        # 되돌릴 때 0024가 time 컬럼을 다시 추가할 수 있도록 압축 전에 null 허용
+        migrations.AlterField(
+            model_name="availabletime",
+            name="time",
+            field=models.TimeField(null=True),
+        ),
+        migrations.RunPython(compact_available_times, expand_available_times),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.1.3 on 2026-10-18 06:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0023_compact_available_times"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="availabletime",
+            name="time",
+        ),
+        migrations.AlterField(
+            model_name="availabletime",
+            name="start_time",
+            field=models.TimeField(),
+        ),
+        migrations.AlterField(
+            model_name="availabletime",
+            name="end_time",
+            field=models.TimeField(),
+        ),
+    ]
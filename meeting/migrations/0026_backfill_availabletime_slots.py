@@ -0,0 +1,48 @@
+# Generated by Django 3.1.3 on 2026-10-18 09:10
+
+from django.db import migrations
+
+SLOT_MINUTES = 10
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def slot_index(start_date, date, time):
+    return (date - start_date).days * SLOTS_PER_DAY + (
+        time.hour * 60 + time.minute
+    ) // SLOT_MINUTES
+
+
+def backfill_slots(apps, schema_editor):
+    # 일정 시작일 0시부터 센 슬롯 순번 채우기
+    AvailableTime = apps.get_model("meeting", "AvailableTime")
+
+    rows = (
+        AvailableTime.objects.filter(start_slot__isnull=True)
+        .select_related("participant__meeting")
+        .only("date", "start_time", "end_time", "participant__meeting__start_date")
+    )
+    batch = []
+    for available_time in rows.iterator():
+        start_date = available_time.participant.meeting.start_date
+        available_time.start_slot = slot_index(
+            start_date, available_time.date, available_time.start_time
+        )
+        available_time.end_slot = slot_index(
+            start_date, available_time.date, available_time.end_time
+        )
+        batch.append(available_time)
+        if len(batch) >= 1000:
+            AvailableTime.objects.bulk_update(batch, ["start_slot", "end_slot"])
+            batch = []
+    AvailableTime.objects.bulk_update(batch, ["start_slot", "end_slot"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0025_availabletime_slot_fields"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slots, migrations.RunPython.noop),
+    ]
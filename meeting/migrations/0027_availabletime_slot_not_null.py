@@ -0,0 +1,23 @@
+# Generated by Django 3.1.3 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0026_backfill_availabletime_slots"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="availabletime",
+            name="start_slot",
+            field=models.IntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="availabletime",
+            name="end_slot",
+            field=models.IntegerField(),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.1.3 on 2026-10-18 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0027_availabletime_slot_not_null"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meeting",
+            name="granularity",
+            field=models.PositiveSmallIntegerField(
+                choices=[(10, "10분"), (20, "20분"), (30, "30분"), (60, "60분")],
+                default=10,
+            ),
+        ),
+    ]
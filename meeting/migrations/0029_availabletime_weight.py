@@ -0,0 +1,20 @@
+# Generated by Django 3.1.3 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0028_meeting_granularity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="availabletime",
+            name="weight",
+            field=models.PositiveSmallIntegerField(
+                choices=[(2, "선호"), (1, "가능하면")], default=2
+            ),
+        ),
+    ]
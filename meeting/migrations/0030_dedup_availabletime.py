@@ -0,0 +1,100 @@
+# Generated by Django 3.1.3 on 2026-10-18 13:20
+
+from datetime import time, timedelta
+
+from django.db import migrations, transaction
+from django.db.models import Exists, OuterRef
+
+BATCH_SIZE = 500
+
+
+def merge_ranges(meeting, rows):
+    # 겹치거나 중복된 구간을 슬롯 단위로 펼쳐 가중치가 같은 연속 구간으로 다시 병합
+    day_slots = 24 * 60 // meeting.granularity
+    slots = {}
+    for start_slot, end_slot, weight in rows:
+        for slot in range(start_slot, end_slot + 1):
+            slots[slot] = max(weight, slots.get(slot, 0))
+
+    ranges = []
+    for slot in sorted(slots):
+        if (
+            ranges
+            and ranges[-1][1] == slot - 1
+            and ranges[-1][2] == slots[slot]
+            and ranges[-1][0] // day_slots == slot // day_slots
+        ):
+            ranges[-1][1] = slot
+        else:
+            ranges.append([slot, slot, slots[slot]])
+    return ranges
+
+
+def slot_label(meeting, slot):
+    days, minutes = divmod(slot * meeting.granularity, 24 * 60)
+    return meeting.start_date + timedelta(days=days), time(minutes // 60, minutes % 60)
+
+
+def dedup_available_times(apps, schema_editor):
+    """
+    참여자별로 겹치거나 중복된 가능 시간 구간을 병합
+    참여자 BATCH_SIZE명씩 짧은 트랜잭션으로 처리하므로 중간에 멈춰도
+    다시 실행하면 남은 참여자부터 이어서 처리
+    """
+    AvailableTime = apps.get_model("meeting", "AvailableTime")
+    Participant = apps.get_model("meeting", "Participant")
+
+    overlapping = AvailableTime.objects.filter(
+        participant=OuterRef("participant"),
+        date=OuterRef("date"),
+        start_slot__lte=OuterRef("end_slot"),
+        end_slot__gte=OuterRef("start_slot"),
+    ).exclude(id=OuterRef("id"))
+    participant_ids = (
+        AvailableTime.objects.filter(Exists(overlapping))
+        .values_list("participant_id", flat=True)
+        .distinct()
+        .order_by("participant_id")
+    )
+
+    last_id = 0
+    while True:
+        batch = list(participant_ids.filter(participant_id__gt=last_id)[:BATCH_SIZE])
+        if not batch:
+            break
+        last_id = batch[-1]
+
+        with transaction.atomic():
+            participants = Participant.objects.select_for_update().filter(id__in=batch)
+            for participant in participants.select_related("meeting"):
+                meeting = participant.meeting
+                rows = AvailableTime.objects.filter(participant=participant)
+                ranges = merge_ranges(
+                    meeting, rows.values_list("start_slot", "end_slot", "weight")
+                )
+                rows.delete()
+                AvailableTime.objects.bulk_create(
+                    AvailableTime(
+                        participant=participant,
+                        date=slot_label(meeting, start_slot)[0],
+                        start_time=slot_label(meeting, start_slot)[1],
+                        end_time=slot_label(meeting, end_slot)[1],
+                        weight=weight,
+                        start_slot=start_slot,
+                        end_slot=end_slot,
+                    )
+                    for start_slot, end_slot, weight in ranges
+                )
+
+
+class Migration(migrations.Migration):
+    # 배치마다 따로 커밋
+    atomic = False
+
+    dependencies = [
+        ("meeting", "0029_availabletime_weight"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedup_available_times, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.3 on 2026-10-18 06:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0030_dedup_availabletime"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="availabletime",
+            unique_together={("participant", "date", "start_time")},
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.1.3 on 2026-10-18 06:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0031_availabletime_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChoosableTimesSnapshot",
+            fields=[
+                (
+                    "meeting",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="choosable_times_snapshot",
+                        serialize=False,
+                        to="meeting.meeting",
+                    ),
+                ),
+                ("version", models.PositiveIntegerField()),
+                ("data", models.JSONField()),
+                ("computed_at", models.DateTimeField()),
+            ],
+        ),
+    ]
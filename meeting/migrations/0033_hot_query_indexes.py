@@ -0,0 +1,43 @@
+# Generated by Django 3.1.3 on 2026-10-18 06:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0032_choosabletimessnapshot"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="confirmedtime",
+            index=models.Index(
+                fields=["meeting", "end_datetime"], name="confirmed_meeting_end_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="confirmedtime",
+            index=models.Index(
+                fields=["start_datetime", "id"], name="confirmed_start_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(
+                fields=["author", "expired_at"], name="meeting_author_expired_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(fields=["expired_at"], name="meeting_expired_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="participant",
+            index=models.Index(
+                condition=models.Q(user__isnull=False),
+                fields=["user", "meeting"],
+                name="participant_user_meeting_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.1.3 on 2026-10-18 06:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0008_auto_20210630_1648"),
+        ("meeting", "0033_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MeetingMembership",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "role",
+                    models.CharField(
+                        choices=[("author", "팀장"), ("participant", "팀원")], max_length=11
+                    ),
+                ),
+                ("expired_at", models.DateTimeField()),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="memberships",
+                        to="meeting.meeting",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="meeting_memberships",
+                        to="profiles.profile",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="meetingmembership",
+            index=models.Index(
+                fields=["profile", "expired_at", "meeting"],
+                name="membership_profile_expired_idx",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="meetingmembership",
+            unique_together={("profile", "meeting", "role")},
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.1.3 on 2026-10-18 15:10
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill_memberships(apps, schema_editor):
+    # 기존 일정의 팀장, 회원 참여자로 프로필별 일정 목록 채우기
+    Meeting = apps.get_model("meeting", "Meeting")
+    Participant = apps.get_model("meeting", "Participant")
+    MeetingMembership = apps.get_model("meeting", "MeetingMembership")
+
+    authors = (
+        (author_id, meeting_id, "author", expired_at)
+        for meeting_id, author_id, expired_at in Meeting.objects.filter(
+            author__isnull=False
+        )
+        .values_list("id", "author_id", "expired_at")
+        .iterator()
+    )
+    participants = (
+        (user_id, meeting_id, "participant", expired_at)
+        for meeting_id, user_id, expired_at in Participant.objects.filter(
+            user__isnull=False
+        )
+        .values_list("meeting_id", "user_id", "meeting__expired_at")
+        .iterator()
+    )
+
+    batch = []
+    for rows in (authors, participants):
+        for profile_id, meeting_id, role, expired_at in rows:
+            batch.append(
+                MeetingMembership(
+                    profile_id=profile_id,
+                    meeting_id=meeting_id,
+                    role=role,
+                    expired_at=expired_at,
+                )
+            )
+            if len(batch) >= BATCH_SIZE:
+                MeetingMembership.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+    MeetingMembership.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0034_meetingmembership"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_memberships, migrations.RunPython.noop),
+    ]
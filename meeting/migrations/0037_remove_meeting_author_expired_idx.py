@@ -0,0 +1,17 @@
+# Generated by Django 3.1.3 on 2026-10-18 07:11
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting", "0036_cachecounter"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="meeting",
+            name="meeting_author_expired_idx",
+        ),
+    ]
@@ -2,6 +2,20 @@ import uuid
 from django.db import models
 
 from profiles.models import Profile
+from .managers import (
+    AvailableTimeManager,
+    ConfirmedTimeQuerySet,
+    MeetingMembershipManager,
+    MeetingQuerySet,
+    MeetingSlotCountManager,
+)
+from .slots import (
+    GRANULARITY_CHOICES,
+    SLOT_MINUTES,
+    WEIGHT_IF_NEEDED,
+    WEIGHT_PREFERRED,
+    slot_index,
+)
 
 
 class Meeting(models.Model):
@@ -18,10 +32,25 @@ class Meeting(models.Model):
     start_time = models.TimeField(null=False)
     end_time = models.TimeField(null=False)
     expired_at = models.DateTimeField(null=False)
+    # 선택 가능한 일정 캐시 버전 (참여/탈퇴, 일정 수정 시 증가)
+    version = models.PositiveIntegerField(default=0)
+    # 슬롯 단위(분)
+    granularity = models.PositiveSmallIntegerField(
+        choices=[(minutes, f"{minutes}분") for minutes in GRANULARITY_CHOICES],
+        default=SLOT_MINUTES,
+    )
+
+    objects = MeetingQuerySet.as_manager()
 
     def __str__(self):
         return "%s의 %s" % (self.author.nickname, self.name)
 
+    class Meta:
+        indexes = [
+            # 만료되지 않은 일정 (선택 가능한 일정 미리 계산 대상)
+            models.Index(fields=["expired_at"], name="meeting_expired_at_idx"),
+        ]
+
 
 class ConfirmedTime(models.Model):
     id = models.BigAutoField(primary_key=True)
@@ -35,9 +64,23 @@ class ConfirmedTime(models.Model):
     place = models.CharField(max_length=18, null=True)
     link = models.URLField(null=True)
 
+    objects = ConfirmedTimeQuerySet.as_manager()
+
     def __str__(self):
         return "%s(%d)" % (self.meeting, self.id)
 
+    class Meta:
+        indexes = [
+            # 일정별 다가오는 확정 일정
+            models.Index(
+                fields=["meeting", "end_datetime"], name="confirmed_meeting_end_idx"
+            ),
+            # 확정 일정 목록 커서 페이지네이션 순서
+            models.Index(
+                fields=["start_datetime", "id"], name="confirmed_start_id_idx"
+            ),
+        ]
+
 
 class MeetingInviteCode(models.Model):
     meeting = models.OneToOneField(
@@ -72,9 +115,23 @@ class Participant(models.Model):
 
     class Meta:
         unique_together = [["meeting", "name"]]
+        indexes = [
+            # 내가 참여한 일정 (비회원 참여자는 제외한 부분 인덱스)
+            models.Index(
+                fields=["user", "meeting"],
+                name="participant_user_meeting_idx",
+                condition=models.Q(user__isnull=False),
+            ),
+        ]
 
 
 class AvailableTime(models.Model):
+    """
+    참여자의 날짜별 연속 참여 가능 구간
+    일정 단위(meeting.granularity분) 슬롯 격자에서 start_time ~ end_time 사이의 슬롯을
+    모두 포함하며, end_time과 end_slot은 구간의 끝이 아닌 마지막 슬롯의 시작 (양 끝 포함)
+    """
+
     id = models.BigAutoField(primary_key=True)
     participant = models.ForeignKey(
         Participant,
@@ -82,4 +139,139 @@ class AvailableTime(models.Model):
         on_delete=models.CASCADE,
     )
     date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    # 선호도 가중치 (선호 / 가능하면), 선택 가능한 일정 점수 계산에 사용
+    weight = models.PositiveSmallIntegerField(
+        choices=[(WEIGHT_PREFERRED, "선호"), (WEIGHT_IF_NEEDED, "가능하면")],
+        default=WEIGHT_PREFERRED,
+    )
+    # 일정 시작일 0시부터 센 일정 단위(granularity) 슬롯 순번
+    # (start_time, end_time에 대응)
+    start_slot = models.IntegerField()
+    end_slot = models.IntegerField()
+
+    objects = AvailableTimeManager()
+
+    def save(self, *args, **kwargs):
+        # 슬롯 순번은 저장 시 date, start_time, end_time으로 채움
+        for name in ("date", "start_time", "end_time"):
+            setattr(
+                self, name, self._meta.get_field(name).to_python(getattr(self, name))
+            )
+        meeting = self.participant.meeting
+        self.start_slot = slot_index(
+            meeting.start_date, self.date, self.start_time, meeting.granularity
+        )
+        self.end_slot = slot_index(
+            meeting.start_date, self.date, self.end_time, meeting.granularity
+        )
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return "%s %s %s~%s" % (
+            self.participant,
+            self.date,
+            self.start_time,
+            self.end_time,
+        )
+
+    class Meta:
+        # 같은 구간이 두 번 저장되지 않도록 (구간은 참여자별로 겹치지 않게 병합해 저장)
+        unique_together = [["participant", "date", "start_time"]]
+
+
+class MeetingSlotCount(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    meeting = models.ForeignKey(
+        Meeting,
+        related_name="slot_counts",
+        on_delete=models.CASCADE,
+    )
+    date = models.DateField()
     time = models.TimeField()
+    count = models.PositiveIntegerField(default=0)
+
+    objects = MeetingSlotCountManager()
+
+    def __str__(self):
+        return "%s %s %s(%d)" % (self.meeting, self.date, self.time, self.count)
+
+    class Meta:
+        unique_together = [["meeting", "date", "time"]]
+
+
+class ChoosableTimesSnapshot(models.Model):
+    """
+    규모가 큰 일정의 선택 가능한 일정 (기본 조회 조건) 계산 결과
+    precompute_choosable_times 워커가 일정 version이 바뀔 때마다 다시 계산
+    """
+
+    meeting = models.OneToOneField(
+        Meeting,
+        related_name="choosable_times_snapshot",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    # 계산에 사용한 일정 version (일정 version과 다르면 다시 계산 대상)
+    version = models.PositiveIntegerField()
+    data = models.JSONField()
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return "%s v%d (%s)" % (self.meeting, self.version, self.computed_at)
+
+
+class MeetingMembership(models.Model):
+    """
+    프로필별 팀장/팀원인 일정 (일정 목록, 참여 여부 조회용 비정규화 테이블)
+    일정 생성, 참여, 나가기, 확정 시 MeetingMembershipManager로 갱신
+    """
+
+    AUTHOR = "author"
+    PARTICIPANT = "participant"
+
+    id = models.BigAutoField(primary_key=True)
+    profile = models.ForeignKey(
+        Profile,
+        related_name="meeting_memberships",
+        on_delete=models.CASCADE,
+    )
+    meeting = models.ForeignKey(
+        Meeting,
+        related_name="memberships",
+        on_delete=models.CASCADE,
+    )
+    role = models.CharField(
+        max_length=11, choices=[(AUTHOR, "팀장"), (PARTICIPANT, "팀원")]
+    )
+    # Meeting.expired_at 복사본
+    expired_at = models.DateTimeField()
+
+    objects = MeetingMembershipManager()
+
+    def __str__(self):
+        return "%s %s(%s)" % (self.profile, self.meeting, self.role)
+
+    class Meta:
+        unique_together = [["profile", "meeting", "role"]]
+        indexes = [
+            # 프로필의 만료되지 않은 일정 id (인덱스만 읽음)
+            models.Index(
+                fields=["profile", "expired_at", "meeting"],
+                name="membership_profile_expired_idx",
+            ),
+        ]
+
+
+class CacheCounter(models.Model):
+    """
+    선택 가능한 일정 캐시 적중/미적중 횟수 (모든 웹 프로세스가 공유)
+    프로세스마다 모아 둔 횟수를 F() UPDATE로 한 번에 더함 (meeting.cache 참고)
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return "%s=%d" % (self.name, self.value)
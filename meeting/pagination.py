@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+
+class MeetingCursorPagination(CursorPagination):
+    # 일정 id(PK 인덱스) 기준 커서 페이지네이션 (COUNT, OFFSET 없이 페이지 조회)
+    page_size = 30
+    ordering = "id"
+
+
+class ConfirmedTimeCursorPagination(CursorPagination):
+    # 다가오는 순서, 시작 시각이 같으면 id 순
+    page_size = 30
+    ordering = ("start_datetime", "id")
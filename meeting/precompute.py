@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .availability import full_range_times, gather_choosable_times
+from .models import ChoosableTimesSnapshot, Meeting, MeetingSlotCount, Participant
+
+# 미리 계산하는 조회 조건 (선택 가능한 일정 기본 조회와 같음)
+PRECOMPUTED_OPTIONS = {"max_missing": 1, "limit": None, "full_missing": False}
+
+
+def is_precomputed_options(options):
+    # 날짜 범위(from_date, to_date)는 저장된 결과를 걸러서 처리
+    return {
+        key: value
+        for key, value in options.items()
+        if key not in ("from_date", "to_date")
+    } == PRECOMPUTED_OPTIONS
+
+
+def usable_snapshot(meeting):
+    """
+    반환해도 되는 저장된 결과 (없으면 None)
+    계산 이후 참여자/일정이 바뀐 결과는 계산 시각부터 CHOOSABLE_TIMES_SNAPSHOT_MAX_AGE초
+    동안만 사용하고, 그 뒤에는 워커가 다시 계산할 때까지 요청 시 바로 계산
+    """
+    snapshot = ChoosableTimesSnapshot.objects.filter(meeting=meeting).first()
+    if snapshot is None or snapshot.version == meeting.version:
+        return snapshot
+
+    age = timezone.now() - snapshot.computed_at
+    if age.total_seconds() > settings.CHOOSABLE_TIMES_SNAPSHOT_MAX_AGE:
+        return None
+    return snapshot
+
+
+def count_subquery(queryset):
+    # 일정별 행 수 (참여자 x 슬롯으로 JOIN이 불어나지 않도록 따로 집계)
+    return Coalesce(
+        Subquery(
+            queryset.filter(meeting=OuterRef("pk"))
+            .order_by()
+            .values("meeting")
+            .annotate(count=Count("pk"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def dirty_meetings():
+    """
+    다시 계산해야 하는 일정 (만료 전이고 저장된 결과가 없거나 version이 다른 일정)
+    중 규모가 기준 이상이거나 이전에 저장된 결과가 있는 일정
+    """
+    large = Q(
+        participants_count__gte=settings.CHOOSABLE_TIMES_PRECOMPUTE_PARTICIPANTS
+    ) | Q(slots_count__gte=settings.CHOOSABLE_TIMES_PRECOMPUTE_SLOTS)
+    return (
+        Meeting.objects.filter(expired_at__gt=timezone.now())
+        .exclude(choosable_times_snapshot__version=F("version"))
+        .annotate(
+            participants_count=count_subquery(Participant.objects),
+            slots_count=count_subquery(MeetingSlotCount.objects),
+        )
+        .filter(large | Q(choosable_times_snapshot__isnull=False))
+        .order_by("id")
+    )
+
+
+def is_large(meeting):
+    return (
+        meeting.participants_count >= settings.CHOOSABLE_TIMES_PRECOMPUTE_PARTICIPANTS
+        or meeting.slots_count >= settings.CHOOSABLE_TIMES_PRECOMPUTE_SLOTS
+    )
+
+
+def compute_snapshot(meeting_id):
+    """
+    일정 하나의 선택 가능한 일정 계산 (워커 프로세스에서 실행)
+    계산 전에 읽은 version을 함께 반환하므로 계산 중 참여자가 바뀌면
+    저장된 결과의 version이 달라 다음 번에 다시 계산된다.
+    """
+    meeting = Meeting.objects.get(id=meeting_id)
+    data = gather_choosable_times(meeting, **PRECOMPUTED_OPTIONS)
+    if data is None:
+        data = list(full_range_times(meeting))
+    return meeting_id, meeting.version, data
+
+
+def store_snapshot(meeting_id, version, data):
+    ChoosableTimesSnapshot.objects.update_or_create(
+        meeting_id=meeting_id,
+        defaults={"version": version, "data": data, "computed_at": timezone.now()},
+    )
+
+
+def precompute(limit=None, workers=None):
+    """
+    규모가 큰 일정의 선택 가능한 일정을 프로세스 풀에서 나누어 계산해 저장
+    (workers=1이면 현재 프로세스에서 계산)
+    기준 아래로 작아진 일정의 저장된 결과는 삭제 (요청 시 바로 계산)
+    계산한 일정 수를 반환
+    """
+    meetings = list(dirty_meetings()[:limit])
+    small = [meeting.id for meeting in meetings if not is_large(meeting)]
+    ChoosableTimesSnapshot.objects.filter(meeting_id__in=small).delete()
+
+    meeting_ids = [meeting.id for meeting in meetings if is_large(meeting)]
+    if not meeting_ids:
+        return 0
+
+    if workers == 1:
+        for meeting_id in meeting_ids:
+            store_snapshot(*compute_snapshot(meeting_id))
+        return len(meeting_ids)
+
+    # 자식 프로세스가 부모의 DB 연결을 물려받지 않도록 닫고 시작
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(compute_snapshot, meeting_ids):
+            store_snapshot(*result)
+    return len(meeting_ids)
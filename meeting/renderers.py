@@ -0,0 +1,12 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class CompactJSONRenderer(JSONRenderer):
+    """
+    열 단위 압축 응답 선택용 렌더러
+    ?format=compact 또는 Accept: application/vnd.bonding.compact+json 요청 시
+    선택되며, 응답 변환은 뷰에서 request.accepted_renderer.format으로 분기한다.
+    """
+
+    media_type = "application/vnd.bonding.compact+json"
+    format = "compact"
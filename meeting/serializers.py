@@ -1,6 +1,8 @@
+import base64
+import binascii
 from datetime import datetime
 from django.db.models import Q
-from django.db import IntegrityError
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from django.core.validators import MaxLengthValidator
 from rest_framework import serializers
@@ -11,6 +13,18 @@ from .models import (
     ConfirmedTime,
     Participant,
     AvailableTime,
+    MeetingSlotCount,
+    MeetingMembership,
+)
+from . import cache
+from .slots import (
+    SLOT_MINUTES,
+    WEIGHT_PREFERRED,
+    decode_slot_bits,
+    expand_range,
+    slot_index,
+    to_minutes,
+    valid_slot,
 )
 from .exceptions import (
     OnlyOClockAvailableException,
@@ -18,6 +32,8 @@ from .exceptions import (
     InvalidInviteCodeException,
     InvalidAvailableTimeException,
     ParticipantNameExistException,
+    GranularityChangeException,
+    MeetingAlreadyConfirmedException,
 )
 from teampang.exceptions import (
     StartTimeIsLaterThanEndTimeException,
@@ -58,16 +74,17 @@ class MeetingTimeSerializer(ScheduleTimeSerializer):
     def is_o_clock(self, time):
         return time.minute == 0 or time.microsecond != 0
 
-    def is_divided_by_ten(self, time):
-        return time.minute % 10 == 0
+    def is_on_slot(self, time, granularity=SLOT_MINUTES):
+        # 슬롯 단위(분)로 나누어 떨어지는 시간인지
+        return to_minutes(time) % granularity == 0
 
     def validate_start_time(self, value):
-        if self.is_divided_by_ten(value) or self.is_last_minute(value):
+        if self.is_on_slot(value) or self.is_last_minute(value):
             return value
         raise UnAvailableTimeException
 
     def validate_end_time(self, value):
-        if self.is_divided_by_ten(value) or self.is_last_minute(value):
+        if self.is_on_slot(value) or self.is_last_minute(value):
             return value
         raise UnAvailableTimeException
 
@@ -123,8 +140,33 @@ class MeetingSerializer(MeetingTimeSerializer):
         if "start_date" in data:
             if data["start_date"] > data["end_date"]:
                 raise StartTimeIsLaterThanEndTimeException
+
+        # 시작/종료 시간은 일정의 슬롯 단위에 맞아야 함
+        granularity = data.get(
+            "granularity", getattr(self.instance, "granularity", SLOT_MINUTES)
+        )
+        start_time = data.get("start_time", getattr(self.instance, "start_time", None))
+        end_time = data.get("end_time", getattr(self.instance, "end_time", None))
+        if start_time and not self.is_on_slot(start_time, granularity):
+            raise UnAvailableTimeException
+        if end_time and not (
+            self.is_on_slot(end_time, granularity) or self.is_last_minute(end_time)
+        ):
+            raise UnAvailableTimeException
         return data
 
+    def validate_granularity(self, value):
+        # 가능 시간이 제출된 뒤에는 슬롯 단위 변경 불가
+        if (
+            self.instance is not None
+            and value != self.instance.granularity
+            and AvailableTime.objects.filter(
+                participant__meeting=self.instance
+            ).exists()
+        ):
+            raise GranularityChangeException
+        return value
+
     class Meta:
         model = Meeting
         fields = (
@@ -135,51 +177,177 @@ class MeetingSerializer(MeetingTimeSerializer):
             "end_date",
             "start_time",
             "end_time",
+            "granularity",
             "confirmed_times",
         )
 
 
+class AvailableTimeListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # 저장된 구간을 일정의 슬롯 단위 목록으로 펼쳐서 반환
+        slot_minutes = SLOT_MINUTES
+        if isinstance(data, models.Manager):
+            slot_minutes = data.instance.meeting.granularity
+            data = data.order_by("date", "start_time").values_list(
+                "date", "start_time", "end_time", "weight"
+            )
+        return [
+            self.child.to_representation({"date": date, "time": time, "weight": weight})
+            for date, start_time, end_time, weight in data
+            for time in expand_range(start_time, end_time, slot_minutes)
+        ]
+
+
 class AvailableTimeSerializer(MeetingTimeSerializer):
+    # 슬롯 단위로 입력받아 참여자별 연속 구간으로 저장
+    # (일정별 슬롯 단위는 ParticipantSerializer.create에서 검사)
+    time = serializers.TimeField()
+
     class Meta:
         model = AvailableTime
-        exclude = ["id", "participant"]
+        fields = ("date", "time", "weight")
+        list_serializer_class = AvailableTimeListSerializer
 
     def validate_time(self, value):
-        if self.is_divided_by_ten(value):
+        if self.is_on_slot(value):
+            return value
+        raise UnAvailableTimeException
+
+    def validate(self, data):
+        return data
+
+
+class AvailableRangeSerializer(MeetingTimeSerializer):
+    # 날짜별 연속 구간 입력 (end_time은 구간의 마지막 슬롯 시작 시간)
+    class Meta:
+        model = AvailableTime
+        fields = ("date", "start_time", "end_time", "weight")
+
+    def validate_start_time(self, value):
+        if self.is_on_slot(value):
+            return value
+        raise UnAvailableTimeException
+
+    def validate_end_time(self, value):
+        if self.is_on_slot(value):
             return value
         raise UnAvailableTimeException
 
     def validate(self, data):
+        if data["start_time"] > data["end_time"]:
+            raise StartTimeIsLaterThanEndTimeException
         return data
 
 
-class ParticipantSerializer(serializers.ModelSerializer):
+class AvailableSlotsValidationMixin:
+    # 참여 가능 시간 슬롯이 일정의 날짜/시간/슬롯 단위에 맞는지 검사
+
+    def validate_slots(self, slots, meeting):
+        """
+        일정의 슬롯 격자(기간 내 날짜)와 비교해 벗어난 슬롯을 한 번에 모아 보고
+        slots: (date, time) 목록 또는 {(date, time): weight} (중복 슬롯은 한 번만 검사)
+        """
+        granularity = meeting.granularity
+        grid = cache.slot_grids.get(meeting.start_time, meeting.end_time, granularity)
+        days = (meeting.end_date - meeting.start_date).days + 1
+
+        slots = set(slots)
+        # 일정의 슬롯 단위에 맞지 않는 시간
+        misaligned = {slot for slot in slots if to_minutes(slot[1]) % granularity}
+        indexes = {
+            slot_index(meeting.start_date, date, time, granularity): (date, time)
+            for date, time in slots - misaligned
+        }
+        invalid = misaligned | {
+            slot
+            for index, slot in indexes.items()
+            if not valid_slot(grid, index, days, granularity)
+        }
+        if invalid:
+            raise InvalidAvailableTimeException(sorted(invalid))
+
+
+class ParticipantSerializer(AvailableSlotsValidationMixin, serializers.ModelSerializer):
     name = serializers.CharField(validators=[NicknameValidator])
     meeting_id = serializers.IntegerField(write_only=True)
     code = serializers.CharField(write_only=True, max_length=50)
-    available_times = AvailableTimeSerializer(many=True)
+    available_times = AvailableTimeSerializer(many=True, required=False)
+    # 압축 입력 형식: 날짜별 구간 목록 또는 슬롯 격자 base64 비트열
+    available_ranges = AvailableRangeSerializer(
+        many=True, required=False, write_only=True
+    )
+    available_bits = serializers.CharField(
+        required=False, write_only=True, allow_blank=True
+    )
 
     class Meta:
         model = Participant
-        fields = ("id", "name", "available_times", "meeting_id", "code")
+        fields = (
+            "id",
+            "name",
+            "available_times",
+            "available_ranges",
+            "available_bits",
+            "meeting_id",
+            "code",
+        )
+
+    def validate_available_bits(self, value):
+        try:
+            return base64.b64decode(value, validate=True)
+        except binascii.Error:
+            raise UnAvailableTimeException
 
-    def validate_times(self, available_times, meeting):
-        # available_times 유효성 검사
-        for time in available_times:
-            # 날짜 유효성 검사
-            if not meeting.start_date <= time["date"] <= meeting.end_date:
+    def validate(self, data):
+        # available_times, available_ranges, available_bits 중 하나는 필수
+        if not {"available_times", "available_ranges", "available_bits"} & set(data):
+            raise serializers.ValidationError(
+                {"available_times": [self.error_messages["required"]]}
+            )
+        return data
+
+    def get_slots(self, validated_data, meeting):
+        # 입력 형식에 따라 {(date, time): weight} 슬롯으로 변환
+        if "available_ranges" in validated_data:
+            weighted = (
+                (
+                    (available_range["date"], time),
+                    available_range.get("weight", WEIGHT_PREFERRED),
+                )
+                for available_range in validated_data["available_ranges"]
+                for time in expand_range(
+                    available_range["start_time"],
+                    available_range["end_time"],
+                    meeting.granularity,
+                )
+            )
+        elif "available_bits" in validated_data:
+            # 비트열은 모두 선호 가중치
+            bits = validated_data["available_bits"]
+            times = cache.slot_grids.get(
+                meeting.start_time, meeting.end_time, meeting.granularity
+            ).times
+            days = (meeting.end_date - meeting.start_date).days + 1
+            if len(bits) * 8 >= days * len(times) + 8:
                 raise InvalidAvailableTimeException
+            weighted = (
+                (slot, WEIGHT_PREFERRED)
+                for slot in decode_slot_bits(bits, meeting.start_date, times)
+            )
+        else:
+            weighted = (
+                ((time["date"], time["time"]), time.get("weight", WEIGHT_PREFERRED))
+                for time in validated_data.get("available_times", [])
+            )
 
-            # 시간 유효성 검사
-            if meeting.start_time < meeting.end_time:
-                if not meeting.start_time <= time["time"] < meeting.end_time:
-                    raise InvalidAvailableTimeException
-            else:
-                if meeting.end_time <= time["time"] < meeting.start_time:
-                    raise InvalidAvailableTimeException
+        # 중복 슬롯은 높은 가중치를 따름
+        slots = {}
+        for slot, weight in weighted:
+            slots[slot] = max(weight, slots.get(slot, 0))
+        return slots
 
     def create_particpant(self, name, meeting):
-        # 생성
+        # 생성 (참여자, 새로 생성했는지) 반환
 
         if self.context["request"].user.is_authenticated:
             user = self.context["request"].user.profile
@@ -187,25 +355,34 @@ class ParticipantSerializer(serializers.ModelSerializer):
             user = None
 
         try:
-            participant = Participant.objects.create(
-                name=name,
-                meeting=meeting,
-                user=user,
-            )
+            # 바깥 트랜잭션(create)이 깨지지 않도록 savepoint 안에서 생성
+            with transaction.atomic():
+                participant = Participant.objects.create(
+                    name=name,
+                    meeting=meeting,
+                    user=user,
+                )
         except IntegrityError:
-            raise ParticipantNameExistException
+            # 같은 사용자가 같은 이름으로 다시 보낸 요청은 기존 참여자로 처리
+            participant = Participant.objects.filter(meeting=meeting, name=name).first()
+            if user is None or participant is None or participant.user_id != user.id:
+                raise ParticipantNameExistException
+            participant.meeting = meeting
+            return participant, False
 
-        return participant
+        MeetingMembership.objects.sync_participant(meeting, participant.user_id)
+        return participant, True
 
+    @transaction.atomic
     def create(self, validated_data):
         # 데이터 추출
         meeting_id = validated_data["meeting_id"]
         code = validated_data["code"]
         name = validated_data["name"]
 
-        # meeting_id에 해당하는 meeting이 존재하는지
+        # meeting_id에 해당하는 meeting이 존재하는지 (슬롯 인원 수 갱신을 위해 잠금)
         try:
-            meeting = Meeting.objects.get(
+            meeting = Meeting.objects.select_for_update().get(
                 Q(id=meeting_id) & Q(expired_at__gt=timezone.now())
             )
         except Meeting.DoesNotExist:
@@ -217,24 +394,83 @@ class ParticipantSerializer(serializers.ModelSerializer):
 
         # 확정 후
         if meeting.confirmed_times.all().exists():
-            participant = self.create_particpant(name, meeting)
+            participant, _ = self.create_particpant(name, meeting)
         # 확정 전
         else:
-            available_times = validated_data["available_times"]
+            slots = self.get_slots(validated_data, meeting)
 
-            if len(available_times) == 0:
+            if len(slots) == 0:
                 raise EmptyTimeException
 
-            self.validate_times(available_times, meeting)
+            self.validate_slots(slots, meeting)
 
             # create participant and availavle_times
-            participant = self.create_particpant(name, meeting)
-            for time in available_times:
-                AvailableTime.objects.create(participant=participant, **time)
+            # 참여자 생성과 가능 시간 일괄 INSERT를 한 트랜잭션으로 커밋
+            participant, created = self.create_particpant(name, meeting)
+            if created:
+                AvailableTime.objects.create_slots(participant, slots)
+                MeetingSlotCount.objects.add_participant(participant, slots)
+            else:
+                # 재시도된 참여 요청은 저장된 가능 시간을 요청한 슬롯으로 교체
+                new_slots, gone_slots = AvailableTime.objects.replace_slots(
+                    participant, slots
+                )
+                MeetingSlotCount.objects.update_slots(meeting.id, new_slots, gone_slots)
 
+        cache.bump_version(meeting.id)
         return participant
 
 
+class AvailableTimeDiffSerializer(
+    AvailableSlotsValidationMixin, serializers.Serializer
+):
+    """
+    참여자 가능 시간 수정 (추가/삭제할 슬롯만 전달)
+    바뀐 슬롯만 저장하고 슬롯별 인원 수도 바뀐 만큼만 증감
+    """
+
+    add = AvailableTimeSerializer(many=True, required=False)
+    remove = AvailableTimeSerializer(many=True, required=False)
+
+    def validate(self, data):
+        if not data.get("add") and not data.get("remove"):
+            raise EmptyTimeException
+        return data
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        # 참여와 같은 조건: 만료 전이고 확정 전인 일정만 (슬롯 인원 수 갱신을 위해 잠금)
+        try:
+            meeting = Meeting.objects.select_for_update().get(
+                Q(id=instance.meeting_id) & Q(expired_at__gt=timezone.now())
+            )
+        except Meeting.DoesNotExist:
+            raise MeetingNotFoundException
+
+        if meeting.confirmed_times.all().exists():
+            raise MeetingAlreadyConfirmedException
+        instance.meeting = meeting
+
+        # 중복 슬롯은 높은 가중치를 따름
+        added = {}
+        for time in validated_data.get("add", []):
+            slot = (time["date"], time["time"])
+            added[slot] = max(time.get("weight", WEIGHT_PREFERRED), added.get(slot, 0))
+        removed = [
+            (time["date"], time["time"]) for time in validated_data.get("remove", [])
+        ]
+
+        self.validate_slots(added, meeting)
+
+        new_slots, gone_slots = AvailableTime.objects.update_slots(
+            instance, added, removed
+        )
+        MeetingSlotCount.objects.update_slots(meeting.id, new_slots, gone_slots)
+
+        cache.bump_version(meeting.id)
+        return instance
+
+
 class MeetingTabSerializer(serializers.ModelSerializer):
     confirmed_times = serializers.SerializerMethodField()
 
@@ -243,9 +479,13 @@ class MeetingTabSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "confirmed_times"]
 
     def get_confirmed_times(self, instance):
-        confirmed_times = instance.confirmed_times.exclude(
-            end_datetime__lt=datetime.now()
-        ).order_by("start_datetime")
+        # 목록 조회 시 upcoming_confirmed_times로 미리 가져온 확정 일정 사용
+        if hasattr(instance, "upcoming_confirmed_times"):
+            confirmed_times = instance.upcoming_confirmed_times
+        else:
+            confirmed_times = instance.confirmed_times.exclude(
+                end_datetime__lt=datetime.now()
+            ).order_by("start_datetime")
         return ConfirmedTimeSerializer(
             confirmed_times, many=True, fields=("id", "start_datetime", "place", "link")
         ).data
@@ -0,0 +1,212 @@
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import time as datetime_time, timedelta
+from types import MappingProxyType
+
+# 일정 범위를 나누는 기본 슬롯 단위(분), 일정별 단위는 Meeting.granularity
+SLOT_MINUTES = 10
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+# 선택 가능한 슬롯 단위 (모두 SLOT_MINUTES의 배수이고 하루를 나누어 떨어지게 함)
+GRANULARITY_CHOICES = (10, 20, 30, 60)
+# 가능 시간 선호도 가중치
+WEIGHT_PREFERRED = 2
+WEIGHT_IF_NEEDED = 1
+
+
+def to_minutes(time):
+    return time.hour * 60 + time.minute
+
+
+def from_minutes(minutes):
+    return datetime_time(minutes // 60, minutes % 60)
+
+
+def slots_per_day(slot_minutes=SLOT_MINUTES):
+    return 24 * 60 // slot_minutes
+
+
+def slot_index(start_date, date, time, slot_minutes=SLOT_MINUTES):
+    # start_date 0시부터 센 슬롯 순번
+    return (date - start_date).days * slots_per_day(slot_minutes) + (
+        to_minutes(time) // slot_minutes
+    )
+
+
+def slot_label(start_date, index, slot_minutes=SLOT_MINUTES):
+    # 슬롯 순번 -> (date, time)
+    days, slot = divmod(index, slots_per_day(slot_minutes))
+    return start_date + timedelta(days=days), from_minutes(slot * slot_minutes)
+
+
+def expand_range(start_time, end_time, slot_minutes=SLOT_MINUTES):
+    # 구간(start_time ~ end_time, 양 끝 포함)에 속한 슬롯 시작 시간
+    for minutes in range(
+        to_minutes(start_time), to_minutes(end_time) + 1, slot_minutes
+    ):
+        yield from_minutes(minutes)
+
+
+def expand_ranges(ranges, slot_minutes=SLOT_MINUTES):
+    # (date, start_time, end_time) 구간 목록 -> (date, time) 슬롯
+    for date, start_time, end_time in ranges:
+        for time in expand_range(start_time, end_time, slot_minutes):
+            yield date, time
+
+
+def compress_slots(slots, slot_minutes=SLOT_MINUTES):
+    """
+    (date, time) 슬롯 목록을 날짜별로 이어지는 구간 (date, start_time, end_time)
+    목록으로 병합 (중복 슬롯 제거)
+    """
+    # 초 단위는 버리고 분 단위 슬롯으로 정규화
+    slots = {(date, from_minutes(to_minutes(time))) for date, time in slots}
+
+    ranges = []
+    for date, time in sorted(slots):
+        if (
+            ranges
+            and ranges[-1][0] == date
+            and to_minutes(time) - to_minutes(ranges[-1][2]) == slot_minutes
+        ):
+            ranges[-1][2] = time
+        else:
+            ranges.append([date, time, time])
+    return [tuple(available_range) for available_range in ranges]
+
+
+def compress_weighted_slots(slots, slot_minutes=SLOT_MINUTES):
+    """
+    {(date, time): weight} 슬롯을 가중치가 같은 슬롯끼리만 이어 붙여
+    (date, start_time, end_time, weight) 구간 목록으로 병합
+    """
+    groups = {}
+    for slot, weight in slots.items():
+        groups.setdefault(weight, []).append(slot)
+
+    return sorted(
+        (*available_range, weight)
+        for weight, group in groups.items()
+        for available_range in compress_slots(group, slot_minutes)
+    )
+
+
+def decode_slot_bits(data, start_date, times):
+    """
+    슬롯 격자 비트열 -> (date, time) 슬롯
+
+    비트 위치 p는 start_date부터 날짜를 이어 붙인 p번째 격자 슬롯
+    (하루 격자 times의 길이가 n일 때 p // n일 뒤의 times[p % n])이며
+    각 바이트의 상위 비트부터 센다.
+    """
+    for index, byte in enumerate(data):
+        if not byte:
+            continue
+        for bit in range(8):
+            if byte & (0x80 >> bit):
+                days, slot = divmod(index * 8 + bit, len(times))
+                yield start_date + timedelta(days=days), times[slot]
+
+
+# 일정 시간 범위의 하루치 슬롯 격자 (공유되므로 변경 불가능한 값만 보관)
+# times: 슬롯 시작 시간, labels: "HH:MM:SS" 문자열, indexes: 분 -> 격자 내 순번
+SlotGrid = namedtuple("SlotGrid", ("times", "labels", "indexes"))
+
+
+def build_slot_grid(start_time, end_time, slot_minutes=SLOT_MINUTES):
+    # end_time은 포함하지 않으며, 자정을 넘는 일정은 0시부터 시작
+    start = to_minutes(start_time)
+    end = to_minutes(end_time)
+    if start < end:
+        minutes = range(start, end, slot_minutes)
+    else:
+        minutes = [*range(0, end, slot_minutes), *range(start, 24 * 60, slot_minutes)]
+
+    times = tuple(from_minutes(minute) for minute in minutes)
+    return SlotGrid(
+        times=times,
+        labels=tuple(time.isoformat() for time in times),
+        indexes=MappingProxyType(
+            {to_minutes(time): index for index, time in enumerate(times)}
+        ),
+    )
+
+
+def slot_grid_size(grid):
+    # 격자 하나가 차지하는 대략적인 메모리(byte)
+    return (
+        sys.getsizeof(grid)
+        + sum(sys.getsizeof(values) for values in grid)
+        + sum(sys.getsizeof(time) for time in grid.times)
+        + sum(sys.getsizeof(label) for label in grid.labels)
+    )
+
+
+class SlotGridCache:
+    """
+    (start_time, end_time, slot_minutes)별 슬롯 격자 LRU 캐시
+
+    일정마다 시간 범위 조합은 몇 가지뿐이라 프로세스 안에서 격자를 공유하고,
+    maxsize를 넘으면 가장 오래 쓰이지 않은 격자부터 버린다.
+    on_hit, on_miss는 적중/미적중마다 호출 (프로세스 간 공유 카운터 집계용)
+    """
+
+    def __init__(self, maxsize=128, on_hit=None, on_miss=None):
+        self.maxsize = maxsize
+        self.on_hit = on_hit
+        self.on_miss = on_miss
+        self.grids = OrderedDict()
+        self.sizes = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, start_time, end_time, slot_minutes=SLOT_MINUTES):
+        key = (to_minutes(start_time), to_minutes(end_time), slot_minutes)
+        with self.lock:
+            grid = self.grids.get(key)
+            if grid is not None:
+                self.hits += 1
+                self.grids.move_to_end(key)
+            else:
+                self.misses += 1
+        # 콜백은 DB에 쓸 수 있으므로 잠금 밖에서 호출
+        callback = self.on_hit if grid is not None else self.on_miss
+        if callback:
+            callback()
+        if grid is not None:
+            return grid
+
+        grid = build_slot_grid(start_time, end_time, slot_minutes)
+        with self.lock:
+            self.grids[key] = grid
+            self.sizes[key] = slot_grid_size(grid)
+            while len(self.grids) > self.maxsize:
+                evicted, _ = self.grids.popitem(last=False)
+                del self.sizes[evicted]
+        return grid
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self.grids),
+                "maxsize": self.maxsize,
+                "memory": sum(self.sizes.values()),
+            }
+
+    def clear(self):
+        with self.lock:
+            self.grids.clear()
+            self.sizes.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def valid_slot(grid, index, days, slot_minutes=SLOT_MINUTES):
+    # 슬롯 순번이 days일 동안의 하루치 격자 grid 안에 있는지
+    day, slot = divmod(index, slots_per_day(slot_minutes))
+    return 0 <= day < days and slot * slot_minutes in grid.indexes
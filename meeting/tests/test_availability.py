@@ -0,0 +1,313 @@
+from datetime import date, time, timedelta
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from meeting.aggregates import GROUP_CONCAT_MAX_LEN, set_group_concat_max_len
+from meeting.availability import (
+    AvailabilityBitset,
+    bit_counts,
+    count_at,
+    count_at_least,
+    meeting_bitset,
+)
+from meeting.models import AvailableTime, Meeting, Participant
+from meeting.slots import (
+    SlotGridCache,
+    compress_slots,
+    expand_ranges,
+    slot_index,
+    valid_slot,
+)
+from profiles.models import Profile
+
+
+def slot_rows(start_date, ranges):
+    # (참여자 이름, date, start_time, end_time) -> AvailableTime처럼 슬롯 순번 구간으로 변환
+    return [
+        (
+            name,
+            slot_index(start_date, day, start_time),
+            slot_index(start_date, day, end_time),
+        )
+        for name, day, start_time, end_time in ranges
+    ]
+
+
+class TestAvailabilityBitset(APITestCase):
+    def setUp(self):
+        self.day1 = date(2021, 4, 1)
+        self.day2 = date(2021, 4, 2)
+
+        self.ranges = [
+            ("p1", self.day1, time(14, 0), time(14, 10)),
+            ("p1", self.day2, time(14, 0), time(14, 0)),
+            ("p2", self.day1, time(14, 10), time(14, 10)),
+            ("p2", self.day2, time(14, 0), time(14, 0)),
+            ("p3", self.day1, time(14, 10), time(14, 10)),
+        ]
+        self.bitset = self.from_ranges(self.ranges)
+
+    def from_ranges(self, ranges):
+        return AvailabilityBitset.from_slots(self.day1, slot_rows(self.day1, ranges))
+
+    def test_one_mask_per_participant(self):
+        self.assertEqual(["p1", "p2", "p3"], self.bitset.members)
+        # 슬롯 위치는 날짜를 이어 붙인 순번 (하루 144개)
+        self.assertEqual(
+            [0b11 << 84 | 1 << 144 + 84, 1 << 85 | 1 << 144 + 84, 1 << 85],
+            self.bitset.masks,
+        )
+
+    def test_bit_counts(self):
+        masks = [0b1011, 0b0110, 0b1110, 0b0010]
+        counts = bit_counts(masks)
+
+        self.assertEqual([1, 4, 2, 2], [count_at(counts, i) for i in range(4)])
+        self.assertEqual(0b1110, count_at_least(counts, 2, 0b1111))
+        self.assertEqual(0b0010, count_at_least(counts, 3, 0b1111))
+        self.assertEqual(0, count_at_least(counts, 5, 0b1111))
+        self.assertEqual(0b1110, count_at_least(counts, 0, 0b1110))
+
+    def test_choosable_times(self):
+        self.assertEqual(
+            [
+                {
+                    "date": "2021-04-01",
+                    "detail": [{"time": "14:10:00", "unavailable_member": None}],
+                },
+                {
+                    "date": "2021-04-02",
+                    "detail": [{"time": "14:00:00", "unavailable_member": "p3"}],
+                },
+            ],
+            self.bitset.choosable_times(),
+        )
+
+    def test_overlapping_ranges_are_counted_once(self):
+        bitset = self.from_ranges(
+            self.ranges + [("p1", self.day1, time(14, 0), time(14, 0))]
+        )
+        self.assertEqual(2, len(bitset.choosable_times()))
+
+    def test_empty_rows(self):
+        bitset = AvailabilityBitset.from_slots(self.day1, [])
+        self.assertEqual([], bitset.members)
+        self.assertEqual([], bitset.choosable_times())
+
+    def test_choosable_times_with_max_missing(self):
+        choosable_times = self.bitset.choosable_times(max_missing=2, full_missing=True)
+
+        detail = choosable_times[0]["detail"]
+        self.assertEqual(["14:00:00", "14:10:00"], [time["time"] for time in detail])
+        self.assertEqual(["p2", "p3"], detail[0]["unavailable_members"])
+        self.assertEqual([], detail[1]["unavailable_members"])
+
+    def test_choosable_times_with_limit(self):
+        choosable_times = self.bitset.choosable_times(max_missing=2, limit=2)
+
+        self.assertEqual(
+            [("2021-04-01", "14:10:00"), ("2021-04-02", "14:00:00")],
+            [
+                (date["date"], time["time"])
+                for date in choosable_times
+                for time in date["detail"]
+            ],
+        )
+
+    def test_choosable_windows(self):
+        bitset = self.from_ranges(
+            [
+                ("p1", self.day1, time(14, 0), time(14, 20)),
+                ("p2", self.day1, time(14, 0), time(14, 10)),
+                ("p2", self.day1, time(14, 30), time(14, 30)),
+            ]
+        )
+
+        self.assertEqual(
+            [
+                {
+                    "start_datetime": "2021-04-01 14:00:00",
+                    "end_datetime": "2021-04-01 14:20:00",
+                    "unavailable_members": [],
+                },
+                {
+                    "start_datetime": "2021-04-01 14:10:00",
+                    "end_datetime": "2021-04-01 14:30:00",
+                    "unavailable_members": ["p2"],
+                },
+            ],
+            bitset.choosable_windows(20, max_missing=1, limit=2),
+        )
+        self.assertEqual(1, len(bitset.choosable_windows(20, max_missing=0)))
+        self.assertEqual(1, len(bitset.choosable_windows(30, max_missing=1)))
+        self.assertEqual([], bitset.choosable_windows(50, max_missing=1))
+
+    def test_choosable_windows_counts_members_missing_any_slot(self):
+        bitset = self.from_ranges(
+            [
+                ("p1", self.day1, time(14, 0), time(14, 10)),
+                ("p2", self.day1, time(14, 10), time(14, 20)),
+                ("p3", self.day1, time(14, 0), time(14, 20)),
+            ]
+        )
+
+        # 슬롯마다는 한 명씩만 빠지지만 구간 전체로는 p1, p2 두 명이 빠짐
+        self.assertEqual([], bitset.choosable_windows(30, max_missing=1))
+        self.assertEqual(
+            ["p1", "p2"],
+            bitset.choosable_windows(30, max_missing=2)[0]["unavailable_members"],
+        )
+
+    def test_choosable_windows_overnight(self):
+        bitset = self.from_ranges(
+            [
+                ("p1", self.day1, time(23, 40), time(23, 50)),
+                ("p1", self.day2, time(0, 0), time(0, 10)),
+            ]
+        )
+
+        windows = bitset.choosable_windows(40, max_missing=0)
+        self.assertEqual(1, len(windows))
+        self.assertEqual("2021-04-01 23:40:00", windows[0]["start_datetime"])
+        self.assertEqual("2021-04-02 00:20:00", windows[0]["end_datetime"])
+
+    def test_meeting_bitset(self):
+        day = date.today()
+        meeting = Meeting.objects.create(
+            name="meeting",
+            author=Profile.objects.create(gender=3, nickname="nickname"),
+            start_date=day,
+            end_date=day,
+            start_time=time(9, 0),
+            end_time=time(12, 0),
+            expired_at=timezone.now() + timedelta(days=1),
+        )
+        for name, start_time, end_time in (
+            ("p1", time(9, 0), time(9, 20)),
+            ("p2", time(9, 10), time(9, 10)),
+        ):
+            AvailableTime.objects.create(
+                participant=Participant.objects.create(meeting=meeting, name=name),
+                date=day,
+                start_time=start_time,
+                end_time=end_time,
+            )
+
+        bitset = meeting_bitset(meeting)
+        self.assertEqual(["p1", "p2"], bitset.members)
+        self.assertEqual([0b111 << 54, 0b010 << 54], bitset.masks)
+        self.assertEqual(
+            ["09:00:00", "09:10:00", "09:20:00"],
+            [time["time"] for time in bitset.choosable_times()[0]["detail"]],
+        )
+
+
+class TestSlots(APITestCase):
+    def test_compress_slots(self):
+        day1 = date(2021, 4, 1)
+        day2 = date(2021, 4, 2)
+        slots = [
+            (day1, time(9, 20)),
+            (day1, time(9, 0)),
+            (day1, time(9, 10)),
+            (day1, time(9, 10)),
+            (day1, time(9, 40)),
+            (day2, time(0, 0)),
+        ]
+
+        ranges = compress_slots(slots)
+        self.assertEqual(
+            [
+                (day1, time(9, 0), time(9, 20)),
+                (day1, time(9, 40), time(9, 40)),
+                (day2, time(0, 0), time(0, 0)),
+            ],
+            ranges,
+        )
+        self.assertEqual(sorted(set(slots)), list(expand_ranges(ranges)))
+
+    def test_bitset_drops_slots_before_start_date(self):
+        bitset = AvailabilityBitset.from_slots(
+            date(2021, 4, 1), [("p1", -3, 1), ("p2", -5, -2)]
+        )
+        self.assertEqual([0b11, 0], bitset.masks)
+
+    def test_slot_grid_cache(self):
+        counts = []
+        grids = SlotGridCache(
+            maxsize=2,
+            on_hit=lambda: counts.append("hit"),
+            on_miss=lambda: counts.append("miss"),
+        )
+
+        grid = grids.get(time(22, 0), time(2, 0))
+        self.assertEqual(24, len(grid.times))
+        self.assertEqual(("00:00:00", "23:50:00"), (grid.labels[0], grid.labels[-1]))
+        self.assertIs(grid, grids.get(time(22, 0), time(2, 0)))
+        with self.assertRaises(TypeError):
+            grid.indexes[0] = 1
+
+        grids.get(time(9, 0), time(18, 0))
+        grids.get(time(9, 0), time(18, 0), slot_minutes=30)
+        stats = grids.stats()
+        self.assertEqual((1, 3), (stats["hits"], stats["misses"]))
+        self.assertEqual(2, stats["size"])
+        self.assertGreater(stats["memory"], 0)
+        self.assertEqual(["miss", "hit", "miss", "miss"], counts)
+
+        # 가장 오래 쓰이지 않은 격자부터 제거
+        self.assertIsNot(grid, grids.get(time(22, 0), time(2, 0)))
+
+    def test_valid_slot(self):
+        grid = SlotGridCache().get(time(22, 0), time(2, 0), slot_minutes=30)
+        start_date = date(2021, 4, 1)
+
+        def valid(day, slot_time):
+            index = slot_index(start_date, day, slot_time, 30)
+            return valid_slot(grid, index, 2, 30)
+
+        self.assertTrue(valid(date(2021, 4, 1), time(1, 30)))
+        self.assertTrue(valid(date(2021, 4, 2), time(23, 30)))
+        self.assertFalse(valid(date(2021, 4, 1), time(2, 0)))
+        self.assertFalse(valid(date(2021, 3, 31), time(23, 30)))
+        self.assertFalse(valid(date(2021, 4, 3), time(0, 0)))
+
+
+class TestChoosableTimesBackendConfig(APITestCase):
+    def test_unknown_backend_is_rejected_at_startup(self):
+        config = apps.get_app_config("meeting")
+        with self.settings(CHOOSABLE_TIMES_BACKEND="unknown"):
+            with self.assertRaises(ImproperlyConfigured):
+                config.ready()
+        config.ready()
+
+    def test_group_concat_max_len_is_raised_on_mysql(self):
+        executed = []
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def execute(self, sql, params):
+                executed.append((sql, params))
+
+        class Connection:
+            def __init__(self, vendor):
+                self.vendor = vendor
+
+            def cursor(self):
+                return Cursor()
+
+        set_group_concat_max_len(None, Connection("sqlite"))
+        self.assertEqual([], executed)
+        set_group_concat_max_len(None, Connection("mysql"))
+        self.assertEqual(
+            [("SET SESSION group_concat_max_len = %s", [GROUP_CONCAT_MAX_LEN])],
+            executed,
+        )
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta, time, date
 
+from django.db import connection
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.dateformat import DateFormat
 
@@ -12,6 +14,8 @@ from meeting.models import (
     Participant,
     ConfirmedTime,
     AvailableTime,
+    MeetingSlotCount,
+    MeetingMembership,
 )
 
 
@@ -79,3 +83,132 @@ class TestAvailableTime(APITestCase):
 
         self.date = datetime.date()
         self.time = time(12, 10, 0)
+
+
+class TestHotQueryIndexes(APITestCase):
+    """일정/참여자/확정 일정 조회가 인덱스를 타는지 EXPLAIN으로 확인"""
+
+    def setUp(self):
+        self.profile = Profile.objects.create(gender=3, nickname="nickname")
+        self.meeting = Meeting.objects.create(
+            name="meeting test",
+            author=self.profile,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=3),
+            start_time=time(14, 0),
+            end_time=time(20, 0),
+            expired_at=timezone.now() + timedelta(days=3),
+        )
+        self.participant = Participant.objects.create(
+            meeting=self.meeting, user=self.profile, name="member"
+        )
+
+    def assertUsesIndex(self, queryset, index_name=None):
+        if connection.vendor == "postgresql":
+            # 행이 적으면 순차 탐색을 고르므로 인덱스 사용 가능 여부만 확인
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+            plan = queryset.explain()
+            self.assertIn("Index", plan)
+        else:
+            plan = queryset.explain()
+            self.assertRegex(plan, r"USING (COVERING )?INDEX")
+        if index_name:
+            self.assertIn(index_name, plan)
+
+    def test_meeting_list(self):
+        # 일정 목록: 프로필의 만료되지 않은 일정 id를 MeetingMembership에서 조회
+        MeetingMembership.objects.add_author(self.meeting)
+        self.assertUsesIndex(
+            Meeting.objects.for_member(self.profile, unexpired=True),
+            "membership_profile_expired_idx",
+        )
+        self.assertUsesIndex(Meeting.objects.filter(expired_at__gt=timezone.now()))
+
+    def test_membership_lookups(self):
+        # retrieve 참여 여부 확인, IsParticipant
+        MeetingMembership.objects.sync_participant(self.meeting, self.profile.id)
+        self.assertUsesIndex(self.meeting.memberships.filter(profile=self.profile))
+        self.assertUsesIndex(
+            self.meeting.memberships.filter(
+                profile=self.profile, role=MeetingMembership.PARTICIPANT
+            )
+        )
+
+    def test_participant_lookups(self):
+        # retrieve 참여 여부 확인, 닉네임 중복 확인
+        self.assertUsesIndex(
+            Participant.objects.filter(user=self.profile, meeting=self.meeting),
+            "participant_user_meeting_idx",
+        )
+        self.assertUsesIndex(
+            Participant.objects.filter(meeting=self.meeting, name="member")
+        )
+
+    def test_confirmed_times(self):
+        self.assertUsesIndex(
+            ConfirmedTime.objects.filter(
+                meeting=self.meeting, end_datetime__gte=timezone.now()
+            ),
+            "confirmed_meeting_end_idx",
+        )
+
+    def test_choosable_times(self):
+        self.assertUsesIndex(
+            AvailableTime.objects.filter(
+                participant=self.participant, date=date.today()
+            )
+        )
+        self.assertUsesIndex(
+            MeetingSlotCount.objects.filter(meeting=self.meeting, date=date.today())
+        )
+
+
+class TestMemberQuerySet(APITestCase):
+    def setUp(self):
+        self.profile = Profile.objects.create(gender=3, nickname="nickname")
+        self.other = Profile.objects.create(gender=3, nickname="other")
+
+        for index in range(6):
+            meeting = Meeting.objects.create(
+                name="meeting test",
+                author=self.profile if index % 3 == 0 else self.other,
+                start_date=date.today(),
+                end_date=date.today(),
+                start_time=time(14, 0),
+                end_time=time(20, 0),
+                expired_at=timezone.now() + timedelta(days=1),
+            )
+            MeetingMembership.objects.add_author(meeting)
+            # 팀장이 참여자이기도 한 일정, 여러 참여자가 있는 일정
+            for name, user in (("a", self.profile), ("b", self.other), ("c", None)):
+                if index % 2 == 0 or user != self.profile:
+                    Participant.objects.create(meeting=meeting, user=user, name=name)
+                    MeetingMembership.objects.sync_participant(
+                        meeting, user and user.id
+                    )
+            ConfirmedTime.objects.create(
+                meeting=meeting,
+                start_datetime=timezone.now(),
+                end_datetime=timezone.now(),
+            )
+
+    def test_for_member_matches_join_distinct(self):
+        for model, member in (
+            (Meeting, Q(author=self.profile) | Q(participants__user=self.profile)),
+            (
+                ConfirmedTime,
+                Q(meeting__author=self.profile)
+                | Q(meeting__participants__user=self.profile),
+            ),
+        ):
+            expected = list(
+                model.objects.filter(member).distinct().order_by("id").values("id")
+            )
+            self.assertEqual(4, len(expected))
+            self.assertEqual(
+                expected,
+                list(
+                    model.objects.for_member(self.profile).order_by("id").values("id")
+                ),
+            )
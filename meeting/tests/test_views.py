@@ -1,6 +1,13 @@
+import base64
+from io import StringIO
 from datetime import datetime, timedelta, time
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from rest_framework.test import APITestCase
@@ -8,12 +15,23 @@ from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from profiles.models import Profile
+from meeting.cache import (
+    CHOOSABLE_TIMES_HITS,
+    cache_stats,
+    reset_cache_stats,
+    slot_grid_stats,
+)
+from meeting.precompute import precompute
 from meeting.models import (
     Meeting,
     ConfirmedTime,
     MeetingInviteCode,
     AvailableTime,
     Participant,
+    MeetingSlotCount,
+    ChoosableTimesSnapshot,
+    MeetingMembership,
+    CacheCounter,
 )
 
 User = get_user_model()
@@ -30,11 +48,155 @@ def get_tokens_for_user(user):
 
 class TestMeetingViewSet(APITestCase):
     def setUp(self):
-        pass
+        self.user = User.objects.create(user_type="B")
+        self.profile = Profile.objects.create(
+            user=self.user, gender=3, nickname="nickname"
+        )
+        self.other = Profile.objects.create(
+            user=User.objects.create(user_type="B", email="other@test.com"),
+            gender=3,
+            nickname="other",
+        )
+
+        token = get_tokens_for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + token["access"])
+
+    def create_meetings(self, count):
+        today = datetime.now().date()
+        for _ in range(count):
+            # 작성한 일정과 참여한 일정, 지난 확정 일정과 다가오는 확정 일정
+            for author, participant in (
+                (self.profile, None),
+                (self.other, self.profile),
+            ):
+                meeting = Meeting.objects.create(
+                    name="meeting test",
+                    author=author,
+                    start_date=today,
+                    end_date=today + timedelta(days=3),
+                    start_time=time(14, 0),
+                    end_time=time(20, 0),
+                    expired_at=timezone.now() + timedelta(days=3),
+                )
+                MeetingMembership.objects.add_author(meeting)
+                if participant:
+                    Participant.objects.create(
+                        meeting=meeting, user=participant, name="member"
+                    )
+                    MeetingMembership.objects.sync_participant(meeting, participant.id)
+                for days in (-1, 1):
+                    start = timezone.now() + timedelta(days=days)
+                    ConfirmedTime.objects.create(
+                        meeting=meeting,
+                        start_datetime=start,
+                        end_datetime=start + timedelta(hours=1),
+                    )
+
+    def test_list_query_count_does_not_grow_with_meetings(self):
+        def list_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get("/meetings")
+            self.assertEqual(response.status_code, 200)
+            return response, len(queries)
+
+        self.create_meetings(1)
+        response, queries = list_queries()
+        self.assertEqual(2, len(response.data["data"]["results"]))
+        for meeting in response.data["data"]["results"]:
+            self.assertEqual(1, len(meeting["confirmed_times"]))
+
+        self.create_meetings(10)
+        response, more_queries = list_queries()
+        self.assertEqual(22, len(response.data["data"]["results"]))
+        # 사용자, 프로필, 일정 페이지, 확정 일정
+        self.assertEqual(4, queries)
+        self.assertEqual(queries, more_queries)
+
+    def test_memberships_follow_create_join_and_exit(self):
+        today = datetime.now().date()
+        response = self.client.post(
+            "/meetings",
+            data={
+                "name": "meeting test",
+                "start_date": today,
+                "end_date": today + timedelta(days=3),
+                "start_time": "14:00",
+                "end_time": "20:00",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        meeting = Meeting.objects.get(id=response.data["data"]["id"])
+        invite_code = MeetingInviteCode.objects.create(meeting=meeting)
+
+        # 팀원으로 참여
+        token = get_tokens_for_user(self.other.user)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + token["access"])
+        response = self.client.get(f"/meetings/{meeting.id}")
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post(
+            "/participants",
+            data={
+                "name": "member",
+                "code": str(invite_code.code),
+                "meeting_id": meeting.id,
+                "available_times": [{"date": today, "time": "14:00"}],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            {
+                (self.profile.id, MeetingMembership.AUTHOR),
+                (self.other.id, MeetingMembership.PARTICIPANT),
+            },
+            set(meeting.memberships.values_list("profile_id", "role")),
+        )
+        response = self.client.get(f"/meetings/{meeting.id}")
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get("/meetings")
+        self.assertEqual(1, len(response.data["data"]["results"]))
+
+        # 일정 나가기
+        response = self.client.delete(f"/meetings/{meeting.id}/participants")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(
+            [MeetingMembership.AUTHOR],
+            list(meeting.memberships.values_list("role", flat=True)),
+        )
+        response = self.client.get(f"/meetings/{meeting.id}")
+        self.assertEqual(response.status_code, 403)
+
+    def test_list_cursor_pagination(self):
+        self.create_meetings(16)
+
+        response = self.client.get("/meetings")
+        page = response.data["data"]
+        self.assertEqual(30, len(page["results"]))
+        self.assertIsNone(page["previous"])
+        ids = [meeting["id"] for meeting in page["results"]]
+
+        response = self.client.get(page["next"])
+        page = response.data["data"]
+        self.assertEqual(2, len(page["results"]))
+        self.assertIsNone(page["next"])
+        ids += [meeting["id"] for meeting in page["results"]]
+        self.assertEqual(sorted(ids), ids)
+        self.assertEqual(32, len(set(ids)))
+
+        # 다가오는 확정 일정 (지난 확정 일정 제외)
+        response = self.client.get("/confirmed-times")
+        page = response.data["data"]
+        self.assertEqual(30, len(page["results"]))
+        response = self.client.get(page["next"])
+        page = response.data["data"]
+        self.assertEqual(2, len(page["results"]))
+        self.assertIsNone(page["next"])
 
 
 class TestParticipantViewSet(APITestCase):
     def setUp(self):
+        cache.clear()
         self.today = datetime.now().date()
         self.tomorrow = self.today + timedelta(days=1)
         self.end_day = self.today + timedelta(days=10)
@@ -190,17 +352,17 @@ class TestParticipantViewSet(APITestCase):
         p2 = Participant.objects.create(meeting=m, name="p2")
         p3 = Participant.objects.create(meeting=m, name="p3")
 
-        AvailableTime.objects.create(participant=p1, date=self.tomorrow, time="14:00")
-        AvailableTime.objects.create(participant=p1, date=self.tomorrow, time="14:10")
-        AvailableTime.objects.create(participant=p1, date=self.tomorrow, time="14:20")
-        AvailableTime.objects.create(participant=p1, date=self.tomorrow, time="14:30")
+        AvailableTime.objects.create(
+            participant=p1, date=self.tomorrow, start_time="14:00", end_time="14:30"
+        )
 
-        AvailableTime.objects.create(participant=p2, date=self.tomorrow, time="14:10")
-        AvailableTime.objects.create(participant=p2, date=self.tomorrow, time="14:20")
-        AvailableTime.objects.create(participant=p2, date=self.tomorrow, time="14:30")
+        AvailableTime.objects.create(
+            participant=p2, date=self.tomorrow, start_time="14:10", end_time="14:30"
+        )
 
-        AvailableTime.objects.create(participant=p3, date=self.tomorrow, time="14:20")
-        AvailableTime.objects.create(participant=p3, date=self.tomorrow, time="14:30")
+        AvailableTime.objects.create(
+            participant=p3, date=self.tomorrow, start_time="14:20", end_time="14:30"
+        )
 
         response = self.client.get(f"/meetings/{m.id}/choosable-times")
 
@@ -215,3 +377,1113 @@ class TestParticipantViewSet(APITestCase):
         for time in date["detail"]:
             self.assertIn("time", time)
             self.assertIn("unavailable_member", time)
+
+    def test_get_choosable_times_with_max_missing_and_limit(self):
+        m = Meeting.objects.create(
+            name="meeting",
+            author=self.profile,
+            start_date=self.tomorrow,
+            end_date=self.end_day,
+            start_time="14:00",
+            end_time="15:00",
+            expired_at=timezone.now() + timedelta(days=10),
+        )
+
+        p1 = Participant.objects.create(meeting=m, name="p1")
+        p2 = Participant.objects.create(meeting=m, name="p2")
+        p3 = Participant.objects.create(meeting=m, name="p3")
+
+        AvailableTime.objects.create(
+            participant=p1, date=self.tomorrow, start_time="14:00", end_time="14:10"
+        )
+        AvailableTime.objects.create(
+            participant=p2, date=self.tomorrow, start_time="14:10", end_time="14:10"
+        )
+        AvailableTime.objects.create(
+            participant=p3, date=self.tomorrow, start_time="14:10", end_time="14:10"
+        )
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times", {"max_missing": 2, "limit": 1}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        detail = response.data["data"][0]["detail"]
+        self.assertEqual(1, len(detail))
+        self.assertEqual("14:10:00", detail[0]["time"])
+        self.assertEqual([], detail[0]["unavailable_members"])
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times", {"max_missing": 2}
+        )
+        detail = response.data["data"][0]["detail"]
+        self.assertEqual(["p2", "p3"], detail[0]["unavailable_members"])
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times", {"limit": "many"}
+        )
+        self.assertEqual(response.status_code, 422)
+
+    def test_get_choosable_times_sql_backend(self):
+        m = Meeting.objects.create(
+            name="meeting",
+            author=self.profile,
+            start_date=self.tomorrow,
+            end_date=self.end_day,
+            start_time="14:00",
+            end_time="15:00",
+            expired_at=timezone.now() + timedelta(days=10),
+        )
+
+        p1 = Participant.objects.create(meeting=m, name="p1")
+        p2 = Participant.objects.create(meeting=m, name="p2")
+
+        # 먼저 조회되는 참여자(p1)의 슬롯이 늦은 날짜, 늦은 시간에 있어도
+        # 백엔드마다 날짜, 시간 순으로 같은 응답
+        AvailableTime.objects.create(
+            participant=p1, date=self.end_day, start_time="14:00", end_time="14:00"
+        )
+        AvailableTime.objects.create(
+            participant=p1, date=self.tomorrow, start_time="14:30", end_time="14:40"
+        )
+        AvailableTime.objects.create(
+            participant=p2, date=self.tomorrow, start_time="14:00", end_time="14:40"
+        )
+        AvailableTime.objects.create(
+            participant=p2, date=self.end_day, start_time="14:50", end_time="14:50"
+        )
+
+        # sql 백엔드는 MeetingSlotCount를 슬롯 격자로 사용
+        call_command("rebuild_slot_counts", m.id, stdout=StringIO())
+
+        for params in ({}, {"max_missing": 0}, {"max_missing": 1, "limit": 2}):
+            python_response = self.client.get(
+                f"/meetings/{m.id}/choosable-times", params
+            )
+            self.assertEqual(python_response.status_code, 200)
+            for backend in ("sql", "table"):
+                cache.clear()
+                with self.settings(CHOOSABLE_TIMES_BACKEND=backend):
+                    response = self.client.get(
+                        f"/meetings/{m.id}/choosable-times", params
+                    )
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(python_response.data, response.data)
+
+        dates = python_response.data["data"]
+        self.assertEqual(
+            [self.tomorrow.isoformat(), self.tomorrow.isoformat()],
+            [date["date"] for date in dates for _ in date["detail"]],
+        )
+
+    def test_slot_counts_follow_join_and_exit(self):
+        response = self.client.post(
+            "/participants",
+            data={
+                "name": "member",
+                "code": str(self.meeting_before_confirm.invite_code.code),
+                "meeting_id": self.meeting_before_confirm.id,
+                "available_times": self.available_times_data,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        participant = Participant.objects.get(id=response.data["data"]["id"])
+
+        other = Participant.objects.create(
+            meeting=self.meeting_before_confirm, name="other"
+        )
+        AvailableTime.objects.create(
+            participant=other,
+            date=self.tomorrow,
+            start_time=self.start_time,
+            end_time=self.start_time,
+        )
+        MeetingSlotCount.objects.add_participant(other)
+
+        slot_counts = self.meeting_before_confirm.slot_counts
+        self.assertEqual(
+            {(self.tomorrow, self.start_time): 2, (self.end_day, self.start_time): 1},
+            {(slot.date, slot.time): slot.count for slot in slot_counts.all()},
+        )
+
+        response = self.client.delete(f"/participants/{other.id}")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual([1, 1], list(slot_counts.values_list("count", flat=True)))
+
+        participant.user = self.profile
+        participant.save()
+        response = self.client.delete(
+            f"/meetings/{self.meeting_before_confirm.id}/participants"
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(slot_counts.exists())
+
+    def test_get_choosable_times_table_backend(self):
+        m = Meeting.objects.create(
+            name="meeting",
+            author=self.profile,
+            start_date=self.tomorrow,
+            end_date=self.end_day,
+            start_time="14:00",
+            end_time="15:00",
+            expired_at=timezone.now() + timedelta(days=10),
+        )
+
+        p1 = Participant.objects.create(meeting=m, name="p1")
+        p2 = Participant.objects.create(meeting=m, name="p2")
+
+        AvailableTime.objects.create(
+            participant=p1, date=self.tomorrow, start_time="14:00", end_time="14:10"
+        )
+        AvailableTime.objects.create(
+            participant=p1, date=self.end_day, start_time="14:00", end_time="14:00"
+        )
+        AvailableTime.objects.create(
+            participant=p2, date=self.tomorrow, start_time="14:10", end_time="14:10"
+        )
+        AvailableTime.objects.create(
+            participant=p2, date=self.end_day, start_time="14:50", end_time="14:50"
+        )
+
+        call_command("rebuild_slot_counts", m.id, stdout=StringIO())
+        self.assertEqual(4, m.slot_counts.count())
+
+        for params in ({}, {"max_missing": 0}, {"max_missing": 1, "limit": 2}):
+            python_response = self.client.get(
+                f"/meetings/{m.id}/choosable-times", params
+            )
+            cache.clear()
+            with self.settings(CHOOSABLE_TIMES_BACKEND="table"):
+                table_response = self.client.get(
+                    f"/meetings/{m.id}/choosable-times", params
+                )
+
+            self.assertEqual(table_response.status_code, 200)
+            self.assertEqual(python_response.data, table_response.data)
+
+    def test_get_choosable_times_limit_within_date_window(self):
+        m = Meeting.objects.create(
+            name="meeting",
+            author=self.profile,
+            start_date=self.tomorrow,
+            end_date=self.end_day,
+            start_time="14:00",
+            end_time="15:00",
+            expired_at=timezone.now() + timedelta(days=10),
+        )
+
+        p1 = Participant.objects.create(meeting=m, name="p1")
+        p2 = Participant.objects.create(meeting=m, name="p2")
+
+        # 전체 상위 슬롯은 내일이지만 조회 범위(마지막 날) 안에서 limit개를 골라야 함
+        for participant in (p1, p2):
+            AvailableTime.objects.create(
+                participant=participant,
+                date=self.tomorrow,
+                start_time="14:00",
+                end_time="14:10",
+            )
+        AvailableTime.objects.create(
+            participant=p1, date=self.end_day, start_time="14:30", end_time="14:40"
+        )
+        call_command("rebuild_slot_counts", m.id, stdout=StringIO())
+
+        url = f"/meetings/{m.id}/choosable-times"
+        params = {"limit": 1, "from": self.end_day.isoformat()}
+        for backend in ("python", "sql", "table"):
+            cache.clear()
+            with self.settings(CHOOSABLE_TIMES_BACKEND=backend):
+                response = self.client.get(url, params)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                [
+                    {
+                        "date": self.end_day.isoformat(),
+                        "detail": [{"time": "14:30:00", "unavailable_member": "p2"}],
+                    }
+                ],
+                response.data["data"],
+            )
+
+        response = self.client.get(url, {**params, "scoring": "weighted"})
+        self.assertEqual(
+            [(self.end_day.isoformat(), "14:30:00")],
+            [(slot["date"], slot["time"]) for slot in response.data["data"]],
+        )
+
+        response = self.client.get(url, {**params, "duration": 20})
+        self.assertEqual(
+            [f"{self.end_day:%Y-%m-%d} 14:30:00"],
+            [window["start_datetime"] for window in response.data["data"]],
+        )
+
+    def test_get_choosable_times_cache(self):
+        url = f"/meetings/{self.meeting_before_confirm.id}/choosable-times"
+        # 이전 테스트에서 프로세스에 모아 둔 횟수 제외
+        reset_cache_stats()
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(10, len(response.data["data"]))
+        self.assertEqual({"hits": 0, "misses": 1}, self.cache_counts())
+
+        # 캐시 적중 시에는 카운터를 DB에 쓰지 않음
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(10, len(response.data["data"]))
+        self.assertFalse(
+            [query for query in queries if "cachecounter" in query["sql"].lower()]
+        )
+        self.assertEqual({"hits": 1, "misses": 1}, self.cache_counts())
+
+        # 모아 둔 횟수는 CHOOSABLE_TIMES_CACHE_STATS_FLUSH번마다 반영
+        hits = CacheCounter.objects.filter(name=CHOOSABLE_TIMES_HITS)
+        with self.settings(CHOOSABLE_TIMES_CACHE_STATS_FLUSH=2):
+            self.client.get(url)
+            self.assertEqual([1], list(hits.values_list("value", flat=True)))
+            self.client.get(url)
+            self.assertEqual([3], list(hits.values_list("value", flat=True)))
+        reset_cache_stats()
+        self.assertEqual({"hits": 0, "misses": 0}, self.cache_counts())
+        self.client.get(url)
+
+        # 참여자 가입 시 버전이 바뀌어 다시 계산
+        response = self.client.post(
+            "/participants",
+            data={
+                "name": "member",
+                "code": str(self.meeting_before_confirm.invite_code.code),
+                "meeting_id": self.meeting_before_confirm.id,
+                "available_times": self.available_times_data,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.meeting_before_confirm.refresh_from_db()
+        self.assertEqual(1, self.meeting_before_confirm.version)
+
+        response = self.client.get(url)
+        self.assertEqual(2, len(response.data["data"]))
+        self.assertEqual({"hits": 1, "misses": 1}, self.cache_counts())
+
+    def cache_counts(self):
+        stats = cache_stats()
+        return {"hits": stats["hits"], "misses": stats["misses"]}
+
+    def test_slot_grid_cache_stats(self):
+        reset_cache_stats()
+
+        # 가능 시간 검사는 일정의 슬롯 격자를 캐시에서 가져옴
+        response = self.client.post(
+            "/participants",
+            data={
+                "name": "member",
+                "code": str(self.meeting_before_confirm.invite_code.code),
+                "meeting_id": self.meeting_before_confirm.id,
+                "available_times": self.available_times_data,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        stats = slot_grid_stats()
+        self.assertEqual(1, stats["hits"] + stats["misses"])
+        self.assertEqual(settings.SLOT_GRID_CACHE_SIZE, stats["maxsize"])
+
+        out = StringIO()
+        call_command("choosable_times_cache_stats", "--reset", stdout=out)
+        self.assertIn("slot grid hits: ", out.getvalue())
+        stats = slot_grid_stats()
+        self.assertEqual((0, 0), (stats["hits"], stats["misses"]))
+
+    def test_get_choosable_times_with_duration(self):
+        m = Meeting.objects.create(
+            name="meeting",
+            author=self.profile,
+            start_date=self.tomorrow,
+            end_date=self.end_day,
+            start_time="14:00",
+            end_time="15:00",
+            expired_at=timezone.now() + timedelta(days=10),
+        )
+
+        p1 = Participant.objects.create(meeting=m, name="p1")
+        AvailableTime.objects.create(
+            participant=p1, date=self.tomorrow, start_time="14:00", end_time="14:50"
+        )
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times", {"duration": 60}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(1, len(response.data["data"]))
+        self.assertEqual(
+            f"{self.tomorrow:%Y-%m-%d} 15:00:00",
+            response.data["data"][0]["end_datetime"],
+        )
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times", {"duration": 15}
+        )
+        self.assertEqual(response.status_code, 422)
+
+    def test_post_available_times_are_stored_as_ranges(self):
+        available_times = [
+            {"date": self.tomorrow, "time": time(14, minute)} for minute in (10, 20, 30)
+        ] + self.available_times_data
+
+        response = self.client.post(
+            "/participants",
+            data={
+                "name": "member",
+                "code": str(self.meeting_before_confirm.invite_code.code),
+                "meeting_id": self.meeting_before_confirm.id,
+                "available_times": available_times,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [
+                (self.tomorrow, time(14, 10), time(14, 30)),
+                (self.end_day, time(14, 10), time(14, 10)),
+            ],
+            list(
+                AvailableTime.objects.order_by("date").values_list(
+                    "date", "start_time", "end_time"
+                )
+            ),
+        )
+        self.assertEqual(4, len(response.data["data"]["available_times"]))
+
+    def test_post_query_count_does_not_grow_with_slots(self):
+        def join(name, available_times):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    "/participants",
+                    data={
+                        "name": name,
+                        "code": str(self.meeting_before_confirm.invite_code.code),
+                        "meeting_id": self.meeting_before_confirm.id,
+                        "available_times": available_times,
+                    },
+                    format="json",
+                )
+            self.assertEqual(response.status_code, 201)
+            return len(queries)
+
+        # 서로 떨어진 슬롯이라 구간으로 합쳐지지 않음
+        many_slots = [
+            {"date": self.tomorrow + timedelta(days=day), "time": time(hour, 20)}
+            for day in range(9)
+            for hour in range(15, 20)
+        ]
+
+        self.assertEqual(
+            join("few", self.available_times_data), join("many", many_slots)
+        )
+        self.assertEqual(
+            len(many_slots),
+            AvailableTime.objects.filter(participant__name="many").count(),
+        )
+
+    def test_post_compact_available_times(self):
+        def join(name, **available_times):
+            response = self.client.post(
+                "/participants",
+                data={
+                    "name": name,
+                    "code": str(self.meeting_before_confirm.invite_code.code),
+                    "meeting_id": self.meeting_before_confirm.id,
+                    **available_times,
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+            return list(
+                AvailableTime.objects.filter(participant__name=name)
+                .order_by("date")
+                .values_list("date", "start_time", "end_time")
+            )
+
+        expected = join(
+            "slots",
+            available_times=[
+                {"date": self.tomorrow, "time": time(14, 10)},
+                {"date": self.tomorrow, "time": time(14, 20)},
+                {"date": self.end_day, "time": time(15, 0)},
+            ],
+        )
+
+        ranges = join(
+            "ranges",
+            available_ranges=[
+                {"date": self.tomorrow, "start_time": "14:10", "end_time": "14:20"},
+                {"date": self.end_day, "start_time": "15:00", "end_time": "15:00"},
+            ],
+        )
+        self.assertEqual(expected, ranges)
+
+        # 슬롯 격자: 일정 시작일부터 날짜를 이어 붙인 14:10 ~ 20:40 격자 슬롯 위치
+        days = (self.end_day - self.tomorrow).days
+        positions = {0, 1, days * 39 + 5}
+        size = ((days + 1) * 39 + 7) // 8
+        mask = sum(1 << (size * 8 - 1 - position) for position in positions)
+        bits = base64.b64encode(mask.to_bytes(size, "big"))
+        self.assertEqual(expected, join("bits", available_bits=bits.decode()))
+
+    def test_post_compact_available_times_invalid(self):
+        data = {
+            "name": "member",
+            "code": str(self.meeting_before_confirm.invite_code.code),
+            "meeting_id": self.meeting_before_confirm.id,
+        }
+        # 일정 기간의 격자 슬롯 수보다 긴 비트열
+        days = (self.end_day - self.tomorrow).days + 1
+        oversized = b"\xff" * ((days * 39 + 7) // 8 + 1)
+
+        for available_times in (
+            {"available_bits": "not base64!"},
+            {"available_bits": base64.b64encode(oversized).decode()},
+            {
+                "available_ranges": [
+                    {"date": self.tomorrow, "start_time": "15:00", "end_time": "14:00"}
+                ]
+            },
+        ):
+            response = self.client.post(
+                "/participants", data={**data, **available_times}, format="json"
+            )
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(Participant.objects.exists())
+
+    def test_get_choosable_times_compact(self):
+        m = Meeting.objects.create(
+            name="meeting",
+            author=self.profile,
+            start_date=self.tomorrow,
+            end_date=self.end_day,
+            start_time="14:00",
+            end_time="15:00",
+            expired_at=timezone.now() + timedelta(days=10),
+        )
+        p1 = Participant.objects.create(meeting=m, name="p1")
+        p2 = Participant.objects.create(meeting=m, name="p2")
+        AvailableTime.objects.create(
+            participant=p1, date=self.tomorrow, start_time="14:00", end_time="14:20"
+        )
+        AvailableTime.objects.create(
+            participant=p2, date=self.tomorrow, start_time="14:10", end_time="14:20"
+        )
+
+        expected = {
+            "slot_minutes": 10,
+            "members": ["p2"],
+            "dates": [
+                {
+                    "date": self.tomorrow.isoformat(),
+                    "slots": [84, 85, 86],
+                    "unavailable_member": [0, None, None],
+                }
+            ],
+        }
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times", {"format": "compact"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(expected, response.data["data"])
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times",
+            HTTP_ACCEPT="application/vnd.bonding.compact+json",
+        )
+        self.assertEqual(expected, response.data["data"])
+
+        # 기본 응답 형식은 그대로 유지
+        response = self.client.get(f"/meetings/{m.id}/choosable-times")
+        self.assertEqual(3, len(response.data["data"][0]["detail"]))
+
+    def test_get_choosable_times_full_range_window(self):
+        m = Meeting.objects.create(
+            name="meeting",
+            author=self.profile,
+            start_date=self.tomorrow,
+            end_date=self.end_day,
+            start_time=time(22, 0),
+            end_time=time(2, 0),
+            expired_at=timezone.now() + timedelta(days=10),
+        )
+        url = f"/meetings/{m.id}/choosable-times"
+
+        response = self.client.get(url)
+        self.assertEqual(10, len(response.data["data"]))
+        detail = response.data["data"][0]["detail"]
+        self.assertEqual(24, len(detail))
+        self.assertEqual(
+            ["00:00:00", "01:50:00", "22:00:00", "23:50:00"],
+            [detail[index]["time"] for index in (0, 11, 12, 23)],
+        )
+
+        response = self.client.get(
+            url,
+            {
+                "from": (self.tomorrow + timedelta(days=2)).isoformat(),
+                "to": (self.tomorrow + timedelta(days=4)).isoformat(),
+            },
+        )
+        self.assertEqual(
+            [
+                (self.tomorrow + timedelta(days=days)).isoformat()
+                for days in range(2, 5)
+            ],
+            [date["date"] for date in response.data["data"]],
+        )
+
+        response = self.client.get(url, {"from": self.end_day.isoformat()})
+        self.assertEqual(1, len(response.data["data"]))
+
+        for params in (
+            {"from": "tomorrow"},
+            {"from": "2021-04-02", "to": "2021-04-01"},
+        ):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 422)
+
+    def test_get_choosable_times_full_day(self):
+        m = Meeting.objects.create(
+            name="meeting",
+            author=self.profile,
+            start_date=self.tomorrow,
+            end_date=self.tomorrow,
+            start_time=time(0, 0),
+            end_time=time(23, 59),
+            expired_at=timezone.now() + timedelta(days=10),
+        )
+
+        response = self.client.get(f"/meetings/{m.id}/choosable-times")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(144, len(response.data["data"][0]["detail"]))
+
+    def test_available_time_slot_index(self):
+        response = self.client.post(
+            "/participants",
+            data={
+                "name": "member",
+                "code": str(self.meeting_before_confirm.invite_code.code),
+                "meeting_id": self.meeting_before_confirm.id,
+                "available_times": self.available_times_data,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+        # 일정 시작일 0시부터 센 10분 슬롯 순번
+        days = (self.end_day - self.tomorrow).days
+        slots = AvailableTime.objects.order_by("date").values_list(
+            "start_slot", "end_slot"
+        )
+        self.assertEqual([(85, 85), (days * 144 + 85, days * 144 + 85)], list(slots))
+
+        # 시작일이 하루 앞당겨지면 순번도 하루만큼 이동
+        response = self.client.patch(
+            f"/meetings/{self.meeting_before_confirm.id}",
+            data={"start_date": self.today, "end_date": self.end_day},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(144 + 85, 144 + 85), ((days + 1) * 144 + 85, (days + 1) * 144 + 85)],
+            list(slots.all()),
+        )
+
+    def test_start_date_moved_later_drops_earlier_available_times(self):
+        m = self.meeting_before_confirm
+        response = self.client.post(
+            "/participants",
+            data={
+                "name": "member",
+                "code": str(m.invite_code.code),
+                "meeting_id": m.id,
+                "available_times": self.available_times_data,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+        # 시작일이 하루 늦춰지면 이전 날짜(내일)의 가능 시간은 일정 범위 밖
+        response = self.client.patch(
+            f"/meetings/{m.id}",
+            data={
+                "start_date": self.tomorrow + timedelta(days=1),
+                "end_date": self.end_day,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        days = (self.end_day - self.tomorrow).days - 1
+        self.assertEqual(
+            [(self.end_day, days * 144 + 85, days * 144 + 85)],
+            list(AvailableTime.objects.values_list("date", "start_slot", "end_slot")),
+        )
+        self.assertEqual(
+            [self.end_day], list(m.slot_counts.values_list("date", flat=True))
+        )
+
+        url = f"/meetings/{m.id}/choosable-times"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [self.end_day.isoformat()], [date["date"] for date in response.data["data"]]
+        )
+        response = self.client.get(url, {"duration": 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(1, len(response.data["data"]))
+
+    def test_meeting_granularity(self):
+        m = Meeting.objects.create(
+            name="meeting",
+            author=self.profile,
+            start_date=self.tomorrow,
+            end_date=self.end_day,
+            start_time=time(14, 0),
+            end_time=time(16, 0),
+            granularity=30,
+            expired_at=timezone.now() + timedelta(days=10),
+        )
+        MeetingInviteCode.objects.create(meeting=m)
+
+        response = self.client.get(f"/meetings/{m.id}/choosable-times")
+        self.assertEqual(
+            ["14:00:00", "14:30:00", "15:00:00", "15:30:00"],
+            [time["time"] for time in response.data["data"][0]["detail"]],
+        )
+
+        def join(name, times):
+            return self.client.post(
+                "/participants",
+                data={
+                    "name": name,
+                    "code": str(m.invite_code.code),
+                    "meeting_id": m.id,
+                    "available_times": [
+                        {"date": self.tomorrow, "time": time} for time in times
+                    ],
+                },
+                format="json",
+            )
+
+        # 슬롯 단위에 맞지 않는 시간
+        self.assertEqual(400, join("p1", [time(14, 10)]).status_code)
+
+        response = join("p1", [time(14, 30), time(15, 0)])
+        self.assertEqual(201, response.status_code)
+        self.assertEqual(2, len(response.data["data"]["available_times"]))
+        self.assertEqual(
+            [(29, 30)],
+            list(AvailableTime.objects.values_list("start_slot", "end_slot")),
+        )
+        self.assertEqual(2, m.slot_counts.count())
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times", {"duration": 60}
+        )
+        self.assertEqual(1, len(response.data["data"]))
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times", {"duration": 20}
+        )
+        self.assertEqual(response.status_code, 422)
+
+        # 가능 시간이 제출된 뒤에는 슬롯 단위 변경 불가
+        response = self.client.patch(
+            f"/meetings/{m.id}", data={"granularity": 10}, format="json"
+        )
+        self.assertEqual(response.status_code, 409)
+
+    def test_get_heatmap(self):
+        m = self.meeting_before_confirm
+        for name, times in (
+            ("p1", [time(14, 10), time(14, 20)]),
+            ("p2", [time(14, 20)]),
+        ):
+            response = self.client.post(
+                "/participants",
+                data={
+                    "name": name,
+                    "code": str(m.invite_code.code),
+                    "meeting_id": m.id,
+                    "available_times": [
+                        {"date": self.tomorrow, "time": time} for time in times
+                    ],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/meetings/{m.id}/heatmap")
+        self.assertEqual(response.status_code, 200)
+
+        heatmap = response.data["data"]
+        # 14:10 ~ 20:30 슬롯 격자, 날짜마다 모든 슬롯의 인원 수
+        self.assertEqual(2, heatmap["members"])
+        self.assertEqual(39, len(heatmap["times"]))
+        self.assertEqual(10, len(heatmap["dates"]))
+        self.assertEqual([1, 2, 0], heatmap["dates"][0]["counts"][:3])
+        self.assertEqual([0] * 39, heatmap["dates"][1]["counts"])
+        heatmap_queries = len(queries)
+
+        response = self.client.get(
+            f"/meetings/{m.id}/heatmap", {"from": self.end_day.isoformat()}
+        )
+        self.assertEqual(
+            [self.end_day.isoformat()],
+            [date["date"] for date in response.data["data"]["dates"]],
+        )
+
+        # 참여자가 늘어도 조회 횟수는 그대로
+        Participant.objects.create(meeting=m, name="p3")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f"/meetings/{m.id}/heatmap")
+        self.assertEqual(heatmap_queries, len(queries))
+
+    def test_get_choosable_times_weighted_scoring(self):
+        m = self.meeting_before_confirm
+        for name, times in (
+            ("p1", [(time(14, 10), 2), (time(14, 20), 1), (time(14, 30), 2)]),
+            ("p2", [(time(14, 10), 1), (time(14, 20), 2), (time(14, 30), 2)]),
+            ("p3", [(time(14, 20), 2), (time(14, 30), 1)]),
+        ):
+            response = self.client.post(
+                "/participants",
+                data={
+                    "name": name,
+                    "code": str(m.invite_code.code),
+                    "meeting_id": m.id,
+                    "available_times": [
+                        {"date": self.tomorrow, "time": time, "weight": weight}
+                        for time, weight in times
+                    ],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [2, 1],
+            [time["weight"] for time in response.data["data"]["available_times"]],
+        )
+        # 가중치가 다른 슬롯은 별도 구간으로 저장
+        self.assertEqual(
+            3, AvailableTime.objects.filter(participant__name="p1").count()
+        )
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times", {"scoring": "weighted"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                {
+                    "date": self.tomorrow.isoformat(),
+                    "time": "14:20:00",
+                    "score": 5,
+                    "unavailable_members": [],
+                    "if_needed_members": ["p1"],
+                },
+                {
+                    "date": self.tomorrow.isoformat(),
+                    "time": "14:30:00",
+                    "score": 5,
+                    "unavailable_members": [],
+                    "if_needed_members": ["p3"],
+                },
+                {
+                    "date": self.tomorrow.isoformat(),
+                    "time": "14:10:00",
+                    "score": 3,
+                    "unavailable_members": ["p3"],
+                    "if_needed_members": ["p2"],
+                },
+            ],
+            response.data["data"],
+        )
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times",
+            {"scoring": "weighted", "max_missing": 0, "limit": 1},
+        )
+        self.assertEqual(["14:20:00"], [slot["time"] for slot in response.data["data"]])
+
+        response = self.client.get(
+            f"/meetings/{m.id}/choosable-times", {"scoring": "unknown"}
+        )
+        self.assertEqual(response.status_code, 422)
+
+    def test_patch_available_times_diff(self):
+        m = self.meeting_before_confirm
+        response = self.client.post(
+            "/participants",
+            data={
+                "name": "member",
+                "code": str(m.invite_code.code),
+                "meeting_id": m.id,
+                "available_times": [
+                    {"date": self.tomorrow, "time": time(14, minute)}
+                    for minute in (10, 20, 30)
+                ]
+                + [{"date": self.end_day, "time": self.start_time}],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        participant = Participant.objects.get(id=response.data["data"]["id"])
+        participant.user = self.profile
+        participant.save()
+
+        other = Participant.objects.create(meeting=m, name="other")
+        AvailableTime.objects.create(
+            participant=other,
+            date=self.tomorrow,
+            start_time=time(14, 20),
+            end_time=time(14, 40),
+        )
+        MeetingSlotCount.objects.add_participant(other)
+
+        response = self.client.patch(
+            f"/participants/{participant.id}/available-times",
+            data={
+                "add": [
+                    {"date": self.tomorrow, "time": time(14, 40), "weight": 1},
+                    {"date": self.tomorrow, "time": time(14, 50)},
+                ],
+                "remove": [
+                    {"date": self.tomorrow, "time": time(14, 20)},
+                    {"date": self.end_day, "time": self.start_time},
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(4, len(response.data["data"]["available_times"]))
+        self.assertEqual(
+            [
+                (self.tomorrow, time(14, 10), time(14, 10), 2),
+                (self.tomorrow, time(14, 30), time(14, 30), 2),
+                (self.tomorrow, time(14, 40), time(14, 40), 1),
+                (self.tomorrow, time(14, 50), time(14, 50), 2),
+            ],
+            list(
+                participant.available_times.order_by("start_time").values_list(
+                    "date", "start_time", "end_time", "weight"
+                )
+            ),
+        )
+
+        # 증감한 인원 수가 처음부터 다시 센 인원 수와 같아야 함
+        counts = {(slot.date, slot.time): slot.count for slot in m.slot_counts.all()}
+        call_command("rebuild_slot_counts", m.id, stdout=StringIO())
+        self.assertEqual(
+            {(slot.date, slot.time): slot.count for slot in m.slot_counts.all()},
+            counts,
+        )
+        self.assertEqual(2, counts[(self.tomorrow, time(14, 40))])
+        self.assertNotIn((self.end_day, self.start_time), counts)
+
+        # 일정 범위를 벗어난 슬롯 추가
+        response = self.client.patch(
+            f"/participants/{participant.id}/available-times",
+            data={"add": [{"date": self.tomorrow, "time": time(21, 0)}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_patch_available_times_diff_requires_open_meeting(self):
+        participant = Participant.objects.create(
+            meeting=self.meeting_before_confirm, name="member", user=self.profile
+        )
+        AvailableTime.objects.create(
+            participant=participant,
+            date=self.tomorrow,
+            start_time=self.start_time,
+            end_time=self.start_time,
+        )
+        url = f"/participants/{participant.id}/available-times"
+        data = {"add": [{"date": self.end_day, "time": self.start_time}]}
+
+        # 확정된 일정
+        ConfirmedTime.objects.create(
+            meeting=self.meeting_before_confirm,
+            start_datetime=datetime.combine(self.tomorrow, self.start_time),
+            end_datetime=datetime.combine(self.tomorrow, self.end_time),
+        )
+        response = self.client.patch(url, data=data, format="json")
+        self.assertEqual(response.status_code, 409)
+
+        # 만료된 일정
+        self.meeting_before_confirm.confirmed_times.all().delete()
+        Meeting.objects.filter(id=self.meeting_before_confirm.id).update(
+            expired_at=timezone.now() - timedelta(days=1)
+        )
+        response = self.client.patch(url, data=data, format="json")
+        self.assertEqual(response.status_code, 404)
+
+        self.assertEqual(1, participant.available_times.count())
+        self.assertFalse(self.meeting_before_confirm.slot_counts.exists())
+
+    def test_post_invalid_available_times_are_reported_together(self):
+        m = self.meeting_before_confirm
+        invalid_times = [
+            {"date": self.today, "time": self.start_time},
+            {"date": self.tomorrow, "time": time(21, 0)},
+            {"date": self.end_day + timedelta(days=1), "time": self.start_time},
+        ]
+        response = self.client.post(
+            "/participants",
+            data={
+                "name": "member",
+                "code": str(m.invite_code.code),
+                "meeting_id": m.id,
+                "available_times": self.available_times_data + invalid_times,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        message = response.data["message"]
+        for invalid_time in invalid_times:
+            self.assertIn(
+                f"{invalid_time['date']} {invalid_time['time']:%H:%M}", message
+            )
+        self.assertFalse(Participant.objects.filter(meeting=m).exists())
+
+        # 중복 슬롯은 한 번만 저장
+        response = self.client.post(
+            "/participants",
+            data={
+                "name": "member",
+                "code": str(m.invite_code.code),
+                "meeting_id": m.id,
+                "available_times": self.available_times_data * 2,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            2, AvailableTime.objects.filter(participant__meeting=m).count()
+        )
+        self.assertEqual([1, 1], list(m.slot_counts.values_list("count", flat=True)))
+
+    def test_retried_join_is_idempotent(self):
+        m = self.meeting_before_confirm
+
+        def join(available_times):
+            return self.client.post(
+                "/participants",
+                data={
+                    "name": "member",
+                    "code": str(m.invite_code.code),
+                    "meeting_id": m.id,
+                    "available_times": available_times,
+                },
+                format="json",
+            )
+
+        first = join(self.available_times_data)
+        self.assertEqual(first.status_code, 201)
+        stored = list(
+            AvailableTime.objects.filter(participant__name="member").values_list(
+                "date", "start_time", "end_time"
+            )
+        )
+
+        # 같은 사용자가 같은 이름으로 다시 보낸 요청
+        retried = join(self.available_times_data)
+        self.assertEqual(retried.status_code, 201)
+        self.assertEqual(first.data["data"]["id"], retried.data["data"]["id"])
+        self.assertEqual(
+            stored,
+            list(
+                AvailableTime.objects.filter(participant__name="member").values_list(
+                    "date", "start_time", "end_time"
+                )
+            ),
+        )
+
+        # 다른 슬롯으로 재시도하면 저장된 가능 시간을 교체
+        response = join([{"date": self.tomorrow, "time": time(15, 0)}])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(1, Participant.objects.filter(meeting=m).count())
+
+        counts = {(slot.date, slot.time): slot.count for slot in m.slot_counts.all()}
+        self.assertEqual({(self.tomorrow, time(15, 0)): 1}, counts)
+        call_command("rebuild_slot_counts", m.id, stdout=StringIO())
+        self.assertEqual(
+            counts,
+            {(slot.date, slot.time): slot.count for slot in m.slot_counts.all()},
+        )
+
+        # 다른 사용자(비로그인)의 같은 이름은 중복
+        self.client.credentials()
+        response = join(self.available_times_data)
+        self.assertEqual(response.status_code, 409)
+
+    def test_get_choosable_times_precomputed(self):
+        m = self.meeting_before_confirm
+        url = f"/meetings/{m.id}/choosable-times"
+
+        def join(name):
+            response = self.client.post(
+                "/participants",
+                data={
+                    "name": name,
+                    "code": str(m.invite_code.code),
+                    "meeting_id": m.id,
+                    "available_times": self.available_times_data,
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+
+        join("p1")
+        with self.settings(CHOOSABLE_TIMES_PRECOMPUTE_PARTICIPANTS=2):
+            # 기준보다 작은 일정은 계산하지 않음
+            self.assertEqual(0, precompute(workers=1))
+            join("p2")
+            self.assertEqual(1, precompute(workers=1))
+            self.assertEqual(0, precompute(workers=1))
+
+        snapshot = ChoosableTimesSnapshot.objects.get(meeting=m)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(snapshot.data, response.data["data"])
+        self.assertEqual("false", response["X-Choosable-Times-Stale"])
+        self.assertIn("Last-Modified", response)
+
+        # 다음 계산 전까지는 이전 결과를 반환
+        join("p3")
+        response = self.client.get(url, {"to": self.tomorrow.isoformat()})
+        self.assertEqual(1, len(response.data["data"]))
+        self.assertEqual("true", response["X-Choosable-Times-Stale"])
+
+        # 변경 이후 오래된 결과는 반환하지 않고 바로 계산
+        ChoosableTimesSnapshot.objects.filter(meeting=m).update(
+            computed_at=timezone.now() - timedelta(minutes=10)
+        )
+        with self.settings(CHOOSABLE_TIMES_SNAPSHOT_MAX_AGE=60):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Choosable-Times-Stale", response)
+        self.assertNotIn("Last-Modified", response)
+
+        # 기본 조건이 아니면 바로 계산
+        response = self.client.get(url, {"max_missing": 0})
+        self.assertNotIn("X-Choosable-Times-Stale", response)
+
+        # 기준 아래로 작아지면 저장된 결과 삭제
+        with self.settings(CHOOSABLE_TIMES_PRECOMPUTE_PARTICIPANTS=5):
+            self.assertEqual(0, precompute(workers=1))
+        self.assertFalse(ChoosableTimesSnapshot.objects.filter(meeting=m).exists())
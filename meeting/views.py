@@ -1,9 +1,13 @@
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Prefetch, F
 from django.utils import timezone
-from datetime import datetime, timedelta
+from django.utils.http import http_date
+from datetime import date, datetime
 from rest_framework.exceptions import NotAuthenticated
 from rest_framework import viewsets, mixins
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from .exceptions import (
@@ -25,6 +29,7 @@ from .serializers import (
     MeetingSerializer,
     MeetingInviteCodeSerializer,
     ParticipantSerializer,
+    AvailableTimeDiffSerializer,
     MeetingDetailSerializer,
     MeetingTabSerializer,
     ConfirmedTimeSerializer,
@@ -34,12 +39,34 @@ from .models import (
     MeetingInviteCode,
     ConfirmedTime,
     Participant,
+    AvailableTime,
+    MeetingSlotCount,
+    MeetingMembership,
 )
+from .availability import (
+    compact_choosable_times,
+    compact_choosable_windows,
+    full_range_times,
+    gather_choosable_times,
+    gather_choosable_windows,
+    meeting_heatmap,
+    weighted_choosable_times,
+)
+from .precompute import is_precomputed_options, usable_snapshot
+from .pagination import ConfirmedTimeCursorPagination, MeetingCursorPagination
+from .renderers import CompactJSONRenderer
+from . import cache
+
+# choosable-times 점수 계산 방식 (?scoring=)
+SCORING_MODES = {
+    "weighted": weighted_choosable_times,
+}
 
 
 class MeetingViewSet(viewsets.ModelViewSet):
     queryset = Meeting.objects.all()
     permission_classes = (IsOwnerOrReadOnly,)
+    pagination_class = MeetingCursorPagination
     lookup_field = "id"
 
     def get_serializer_class(self):
@@ -61,7 +88,24 @@ class MeetingViewSet(viewsets.ModelViewSet):
         )
         aware_expired_time = timezone.make_aware(expired_time)
 
-        serializer.save(author=self.get_author(), expired_at=aware_expired_time)
+        with transaction.atomic():
+            meeting = serializer.save(
+                author=self.get_author(), expired_at=aware_expired_time
+            )
+            MeetingMembership.objects.add_author(meeting)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        previous_start_date = serializer.instance.start_date
+
+        # 일정 수정 시 선택 가능한 일정 캐시 버전 증가
+        meeting = serializer.save(version=F("version") + 1)
+
+        # 시작일이 바뀌면 가능 시간의 슬롯 순번 이동
+        days = (meeting.start_date - previous_start_date).days
+        if days:
+            AvailableTime.objects.shift_slots(meeting, days)
+            meeting.slot_counts.filter(date__lt=meeting.start_date).delete()
 
     def list(self, request, *args, **kwargs):
 
@@ -84,9 +128,17 @@ class MeetingViewSet(viewsets.ModelViewSet):
         # 팀원이거나 팀장인 일정 조회
         author = self.get_author()
         queryset = (
-            self.queryset.filter(Q(author=author) | Q(participants__user=author))
-            .distinct()
-            .exclude(expired_at__lt=timezone.now())
+            self.queryset.for_member(author, unexpired=True)
+            # 페이지의 다가오는 확정 일정을 한 번에 조회
+            .prefetch_related(
+                Prefetch(
+                    "confirmed_times",
+                    queryset=ConfirmedTime.objects.exclude(
+                        end_datetime__lt=timezone.now()
+                    ).order_by("start_datetime"),
+                    to_attr="upcoming_confirmed_times",
+                )
+            )
         )
 
         page = self.paginate_queryset(queryset)
@@ -105,10 +157,8 @@ class MeetingViewSet(viewsets.ModelViewSet):
 
         # 일정 조회를 위해 팀원, 팀장 접근 시 일정 정보 반환
         author = self.get_author()
-        if author != meeting.author:
-            participant = meeting.participants.filter(user=author)
-            if not bool(participant):
-                raise NotParticipantException
+        if not meeting.memberships.filter(profile=author).exists():
+            raise NotParticipantException
         serializer = MeetingDetailSerializer(meeting)
         return Response(serializer.data)
 
@@ -131,183 +181,176 @@ class MeetingViewSet(viewsets.ModelViewSet):
         serializer = MeetingInviteCodeSerializer(invite_code)
         return Response(data=serializer.data, status=200)
 
-    def ten_minutes(self, hour, min_start=0, min_end=60):
-
-        detail = []
-        for i in range(min_start, min_end, 10):
-            detail_data = {
-                "time": f"{hour:02d}:{i:<02d}:00",
-                "unavailable_member": None,
-            }
-            detail.append(detail_data)
-        return detail
-
-    def start_end(self, start_time, end_time):
-        detail = []
-
-        detail.extend(
-            self.ten_minutes(hour=start_time.hour, min_start=start_time.minute)
+    def confirm_full_range(self, meeting, from_date=None, to_date=None, **options):
+        # 요청한 날짜 범위(from ~ to)의 날짜만 생성
+        return list(
+            full_range_times(
+                meeting, from_date, to_date, options.get("full_missing", False)
+            )
         )
 
-        for time in range(start_time.hour + 1, end_time.hour - 1):
-            detail.extend(self.ten_minutes(time))
-
-        detail.extend(self.ten_minutes(hour=end_time.hour, min_end=end_time.minute))
+    def get_query_int(self, name, default=None):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return default
 
-        return detail
-
-    def end_start(self, start_time, end_time):
-        detail = []
-
-        for time in range(0, end_time.hour):
-            detail.extend(self.ten_minutes(time))
+        try:
+            value = int(value)
+        except ValueError:
+            raise UnprocessableEntityException
 
-        detail.extend(self.ten_minutes(hour=end_time.hour, min_end=end_time.minute))
-        detail.extend(
-            self.ten_minutes(hour=start_time.hour, min_start=start_time.minute)
-        )
+        if value < 0:
+            raise UnprocessableEntityException
+        return value
 
-        for time in range(start_time.hour + 1, 24):
-            detail.extend(self.ten_minutes(time))
+    def get_query_date(self, name):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
 
-        return detail
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise UnprocessableEntityException
 
-    def combine_date_detail(self, meeting, detail):
-        choosable_times = []
-        # construct full available data detail
-        start_date = meeting.start_date
-        end_date = meeting.end_date
+    def get_date_window(self):
+        # from, to: 조회할 날짜 범위 (양 끝 포함)
+        from_date = self.get_query_date("from")
+        to_date = self.get_query_date("to")
+        if from_date and to_date and from_date > to_date:
+            raise UnprocessableEntityException
+        return from_date, to_date
 
-        delta = end_date - start_date
-        for day in range(delta.days + 1):
-            date_data = start_date + timedelta(days=day)
-            date = {"date": date_data, "detail": detail}
-            choosable_times.append(date)
+    # 선택 가능한 일정 목록 가져오기
+    @action(
+        detail=True,
+        methods=["GET"],
+        url_path="choosable-times",
+        permission_classes=[IsAuthorOrAdmin],
+        renderer_classes=[JSONRenderer, CompactJSONRenderer],
+    )
+    def get_choosable_times(self, request, *args, **kwargs):
+        meeting = self.get_object()
 
-        return choosable_times
+        # max_missing: 허용할 불참 인원 수, limit: 불참 인원이 적은 상위 슬롯 수
+        # duration: 분 단위 길이, 지정 시 연속 구간 목록 반환
+        # scoring=weighted: 선호도 가중치 합이 높은 순으로 슬롯 목록 반환
+        max_missing = self.get_query_int("max_missing")
+        options = {
+            "max_missing": 1 if max_missing is None else max_missing,
+            "limit": self.get_query_int("limit"),
+        }
+        duration = self.get_query_int("duration")
+        scoring = request.query_params.get("scoring")
+        if scoring is not None:
+            if scoring not in SCORING_MODES or duration is not None:
+                raise UnprocessableEntityException
+            options["scoring"] = scoring
+        elif duration is not None:
+            if duration == 0 or duration % meeting.granularity != 0:
+                raise UnprocessableEntityException
+            options["duration"] = duration
+        else:
+            options["full_missing"] = max_missing is not None
+
+        from_date, to_date = self.get_date_window()
+        if from_date:
+            options["from_date"] = from_date
+        if to_date:
+            options["to_date"] = to_date
+
+        # 규모가 큰 일정은 워커가 미리 계산해 둔 결과를 반환
+        snapshot = None
+        if is_precomputed_options(options):
+            snapshot = usable_snapshot(meeting)
+        if snapshot is not None:
+            choosable_times = [
+                times
+                for times in snapshot.data
+                if self.in_date_window(times["date"], from_date, to_date)
+            ]
+        else:
+            choosable_times = cache.get_choosable_times(
+                meeting,
+                lambda: self.compute_choosable_times(meeting, **options),
+                **options,
+            )
 
-    def confirm_full_range(self, meeting):
+        # ?format=compact 또는 Accept 헤더로 열 단위 압축 응답 선택
+        # (점수 순위 목록은 이미 슬롯당 한 항목이라 그대로 반환)
+        if (
+            request.accepted_renderer.format == CompactJSONRenderer.format
+            and "scoring" not in options
+        ):
+            if "duration" in options:
+                choosable_times = compact_choosable_windows(choosable_times)
+            else:
+                choosable_times = compact_choosable_times(
+                    choosable_times, meeting.granularity
+                )
+
+        response = Response(data=choosable_times, status=200)
+        if snapshot is not None:
+            # 계산 시각, 계산 이후 참여자/일정이 바뀌었는지
+            response["Last-Modified"] = http_date(snapshot.computed_at.timestamp())
+            response["X-Choosable-Times-Stale"] = str(
+                snapshot.version != meeting.version
+            ).lower()
+        return response
+
+    def compute_choosable_times(self, meeting, from_date=None, to_date=None, **options):
+        # 날짜 범위는 각 집계 방식에 넘겨 limit보다 먼저 적용
+        if "scoring" in options:
+            scoring = SCORING_MODES[options["scoring"]]
+            return (
+                scoring(
+                    meeting,
+                    options["max_missing"],
+                    options["limit"],
+                    from_date=from_date,
+                    to_date=to_date,
+                )
+                or []
+            )
 
-        # construct full available time detail
-        start_time = meeting.start_time
-        end_time = meeting.end_time
+        if "duration" in options:
+            return (
+                gather_choosable_windows(
+                    meeting, from_date=from_date, to_date=to_date, **options
+                )
+                or []
+            )
 
-        if (end_time.hour == 23) and (end_time.minute == 59):
-            end_time = 24
+        result_times = gather_choosable_times(
+            meeting, from_date=from_date, to_date=to_date, **options
+        )
 
-        if start_time < end_time:
-            # list
-            detail = self.start_end(start_time, end_time)
-        else:
-            # dictionary
-            detail = self.end_start(start_time, end_time)
-
-        return self.combine_date_detail(meeting, detail)
-
-    def gather_choosable_times(self, choosable_times, mem_num, member):
-        for i, choosable_time in enumerate(choosable_times):
-            detail = []
-            for time in choosable_time["detail"]:
-                if len(time["member"]) >= (mem_num - 1):
-                    unavailable_member = set(member) - set(time["member"])
-                    time["unavailable_member"] = (
-                        unavailable_member.pop()
-                        if len(unavailable_member) != 0
-                        else None
-                    )
-                    del time["member"]
-                    detail.append(time)
-
-            choosable_times[i]["detail"] = detail
-
-        result_times = []
-        for choosable_time in choosable_times:
-            if choosable_time["detail"]:
-                result_times.append(choosable_time)
+        # 참여자 없이 팀장이 일정 확정하는 경우
+        if result_times is None:
+            return self.confirm_full_range(meeting, from_date, to_date, **options)
 
+        # 참여자가 존재하는 경우
         return result_times
 
-    def confirm_gatherging_range(self, serializer):
-        member = []
-        choosable_times = []
-        mem_num = 0
-        # available_times 수합하는 로직
-        for participant in serializer.data:
-            if participant["available_times"]:
-                for time_data in participant["available_times"]:
-                    # 해당 날짜가 이미 choosable_times 리스트에 있는 지 확인
-                    i = next(
-                        (
-                            i
-                            for i, date_item in enumerate(choosable_times)
-                            if date_item["date"] == time_data["date"]
-                        ),
-                        None,
-                    )
-
-                    if i is None:
-                        date = {
-                            "date": time_data["date"],
-                            "detail": [
-                                {
-                                    "time": time_data["time"],
-                                    "member": [participant["name"]],
-                                }
-                            ],
-                        }
-                        choosable_times.append(date)
-                    else:
-                        # 해당 시간이 이미 detail 리스트에 있는 지 확인
-                        j = next(
-                            (
-                                j
-                                for j, time_item in enumerate(
-                                    choosable_times[i]["detail"]
-                                )
-                                if time_item["time"] == time_data["time"]
-                            ),
-                            None,
-                        )
-                        if j is None:
-                            choosable_times[i]["detail"].append(
-                                {
-                                    "time": time_data["time"],
-                                    "member": [participant["name"]],
-                                }
-                            )
-                        else:
-                            choosable_times[i]["detail"][j]["member"].append(
-                                participant["name"]
-                            )
-                mem_num += 1
-                member.append(participant["name"])
-
-        return self.gather_choosable_times(choosable_times, mem_num, member)
+    def in_date_window(self, day, from_date=None, to_date=None):
+        # day: "YYYY-MM-DD" 문자열
+        if from_date and day < from_date.isoformat():
+            return False
+        if to_date and day > to_date.isoformat():
+            return False
+        return True
 
-    # 선택 가능한 일정 목록 가져오기
+    # 슬롯별 가능 인원 수(히트맵) 가져오기
     @action(
         detail=True,
         methods=["GET"],
-        url_path="choosable-times",
+        url_path="heatmap",
         permission_classes=[IsAuthorOrAdmin],
     )
-    def get_choosable_times(self, request, *args, **kwargs):
+    def get_heatmap(self, request, *args, **kwargs):
         meeting = self.get_object()
-        # 참여 가능 시간이 없는 참여자 제외
-        participants = meeting.participants.filter(
-            available_times__isnull=False
-        ).distinct()
-        serializer = ParticipantSerializer(participants, many=True)
-
-        # 참여자 없이 팀장이 일정 확정하는 경우
-        if len(serializer.data) == 0:
-            choosable_times = self.confirm_full_range(meeting)
-            return Response(data=choosable_times, status=200)
-
-        # 참여자가 존재하는 경우
-        result_times = self.confirm_gatherging_range(serializer)
-
-        return Response(data=result_times, status=200)
+        heatmap = meeting_heatmap(meeting, *self.get_date_window())
+        return Response(data=heatmap, status=200)
 
     # 일정 확정하기
     @action(
@@ -343,7 +386,8 @@ class MeetingViewSet(viewsets.ModelViewSet):
             time.save()
 
         meeting.expired_at = expired_time
-        meeting.save()
+        meeting.save(update_fields=["expired_at"])
+        MeetingMembership.objects.sync_expired_at(meeting)
 
         return Response(data={"message": "일정 확정 성공"}, status=201)
 
@@ -356,9 +400,16 @@ class MeetingViewSet(viewsets.ModelViewSet):
     )
     def exit_participant(self, request, *args, **kwargs):
         meeting = self.get_object()
-        participant = meeting.participants.filter(user__user=request.user)
-
-        participant.delete()
+        participants = meeting.participants.filter(user__user=request.user)
+
+        with transaction.atomic():
+            # 슬롯 인원 수 갱신을 위해 일정 잠금
+            Meeting.objects.select_for_update().get(id=meeting.id)
+            for participant in participants:
+                MeetingSlotCount.objects.remove_participant(participant)
+            participants.delete()
+            MeetingMembership.objects.sync_participant(meeting, request.user.profile.id)
+            cache.bump_version(meeting.id)
         return Response(status=204)
 
 
@@ -386,9 +437,31 @@ class ParticipantViewset(
         else:
             raise UnprocessableEntityException
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        Meeting.objects.select_for_update().get(id=instance.meeting_id)
+        MeetingSlotCount.objects.remove_participant(instance)
+        instance.delete()
+        MeetingMembership.objects.sync_participant(instance.meeting, instance.user_id)
+        cache.bump_version(instance.meeting_id)
+
+    @action(
+        detail=True,
+        methods=["PATCH"],
+        url_path="available-times",
+        permission_classes=(IsAuthenticated, IsOwnerOrAuthor),
+    )
+    def update_available_times(self, request, *args, **kwargs):
+        # 추가/삭제할 슬롯만 받아 가능 시간 수정
+        participant = self.get_object()
+        serializer = AvailableTimeDiffSerializer(participant, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(ParticipantSerializer(participant).data)
+
 
 class ConfirmedTimesViewset(viewsets.ModelViewSet):
-    pagination_class = None
+    pagination_class = ConfirmedTimeCursorPagination
     serializer_class = ConfirmedTimeSerializer
     permission_classes = (IsAuthorOrReadOnly,)
     http_method_names = ("patch", "get", "delete")
@@ -404,23 +477,20 @@ class ConfirmedTimesViewset(viewsets.ModelViewSet):
     def get_queryset(self):
         # 팀장 또는 참가자인 meeting의 confiremd_times 조회
         author = self.get_author()
-        result = (
-            ConfirmedTime.objects.filter(
-                Q(meeting__author=author) | Q(meeting__participants__user=author)
-            )
-            .distinct()
-            .exclude(end_datetime__lt=timezone.now())
+        result = ConfirmedTime.objects.for_member(author).exclude(
+            end_datetime__lt=timezone.now()
         )
 
         return result
 
     def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset().select_related("meeting"))
         serializer = self.serializer_class(
-            self.get_queryset(),
+            page,
             many=True,
             fields=("id", "meeting", "meeting_name", "start_datetime", "end_datetime"),
         )
-        return Response(data=serializer.data, status=200)
+        return self.get_paginated_response(serializer.data)
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()